@@ -17,26 +17,40 @@ __version__ = "0.1.0"
 __author__ = "LightGUIAgent Contributors"
 __license__ = "MIT"
 
-# Core agent
-from lightguiagent.agent import LightGUIAgent
+# Public names and the modules they live in. They are imported on first
+# attribute access (PEP 562), so importing one submodule, e.g.
+# lightguiagent.grid_converter, doesn't pull in the agent, the anthropic SDK
+# or PIL
+_EXPORTS = {
+    # Core agent
+    "LightGUIAgent": "lightguiagent.agent",
+    # Grid system components
+    "GridOverlay": "lightguiagent.grid_overlay",
+    "GridConverter": "lightguiagent.grid_converter",
+    # Claude client
+    "ClaudeClient": "lightguiagent.claude_client",
+    # Logging
+    "TaskLogger": "lightguiagent.logger",
+    "ThreadedTaskLogger": "lightguiagent.logger",
+    # Configuration
+    "CLAUDE_CONFIG": "lightguiagent.config",
+    "GRID_CONFIG": "lightguiagent.config",
+    "AGENT_CONFIG": "lightguiagent.config",
+    "ADB_CONFIG": "lightguiagent.config",
+}
+
 
-# Grid system components
-from lightguiagent.grid_overlay import GridOverlay
-from lightguiagent.grid_converter import GridConverter
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Claude client
-from lightguiagent.claude_client import ClaudeClient
+    import importlib
 
-# Logging
-from lightguiagent.logger import TaskLogger
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
 
-# Configuration
-from lightguiagent.config import (
-    CLAUDE_CONFIG,
-    GRID_CONFIG,
-    AGENT_CONFIG,
-    ADB_CONFIG,
-)
 
 __all__ = [
     # Core
@@ -48,6 +62,7 @@ __all__ = [
     "ClaudeClient",
     # Logging
     "TaskLogger",
+    "ThreadedTaskLogger",
     # Config
     "CLAUDE_CONFIG",
     "GRID_CONFIG",
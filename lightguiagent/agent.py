@@ -3,17 +3,44 @@
 Coordinates screenshot capture, grid overlay, Claude API calls, and action execution.
 """
 
+import base64
+import io
+import re
+import queue
+import shlex
+import shutil
+import statistics
+import struct
 import subprocess
+import threading
 import time
+import traceback
+from array import array
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
+from xml.etree import ElementTree
+
+from PIL import Image, ImageChops, ImageStat
 
 from lightguiagent.config import AGENT_CONFIG, ADB_CONFIG, LOGS_DIR, GRID_CONFIG
-from lightguiagent.grid_overlay import GridOverlay
+from lightguiagent.grid_overlay import GridOverlay, scale_grid_config
 from lightguiagent.grid_converter import GridConverter
 from lightguiagent.claude_client import ClaudeClient
-from lightguiagent.logger import TaskLogger
+from lightguiagent.logger import ThreadedTaskLogger
+
+
+# uiautomator node bounds, e.g. "[0,84][1080,231]"
+UI_BOUNDS_RE = re.compile(r"\[(-?\d+),(-?\d+)\]\[(-?\d+),(-?\d+)\]")
+
+# Adaptive settle wait: poll reduced frames until several in a row match.
+# Each probe is a full screencap, reduced on the host
+STABLE_MIN_WAIT = 1.0  # seconds before the first probe, so the action can start
+STABLE_POLL_INTERVAL = 0.1  # seconds between probes
+STABLE_PAIRS = 3  # consecutive matching probe pairs that count as settled
+STABLE_PROBE_FACTOR = 8  # probes are 1/8 of the screen in each dimension
+STABLE_THRESHOLD = 2.0  # mean per-channel difference (0-255) that counts as still
 
 
 class LightGUIAgent:
@@ -24,6 +51,7 @@ class LightGUIAgent:
         api_key: Optional[str] = None,
         device_serial: Optional[str] = None,
         verbose: bool = None,
+        prompt_caching: Optional[bool] = None,
     ):
         """Initialize agent with components.
 
@@ -31,22 +59,23 @@ class LightGUIAgent:
             api_key: Claude API key
             device_serial: ADB device serial (None = auto-detect)
             verbose: Print detailed logs
+            prompt_caching: Enable Claude prompt caching (None = use config)
         """
         self.verbose = verbose if verbose is not None else AGENT_CONFIG["verbose"]
 
         # Initialize components
-        self.claude = ClaudeClient(api_key=api_key)
-        self.grid_overlay = GridOverlay()
-        self.grid_converter = GridConverter()
+        self.claude = ClaudeClient(api_key=api_key, prompt_caching=prompt_caching)
+        self._configure_grid(GRID_CONFIG["screen_width"], GRID_CONFIG["screen_height"])
 
         # ADB configuration
         self.device_serial = device_serial or ADB_CONFIG["device_serial"]
-        self.screenshot_path = ADB_CONFIG["screenshot_path"]
+        self.raw_screencap = ADB_CONFIG["raw_screencap"]
 
         # Execution state
         self.history = []
         self.step_count = 0
-        self.step_times = []  # Track timing for each step
+        self.step_times = array("d")  # Track timing for each step
+        self._keep_raw_frames = True  # Whether run_task saves unannotated frames
 
         # Logger (initialized per task)
         self.logger = None
@@ -54,21 +83,32 @@ class LightGUIAgent:
         # yadb availability flag
         self.yadb_available = False
 
+        # Background worker that captures the next screenshot while the
+        # current step is still being logged and recorded
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="capture")
+        self._capture_future: Optional[Future] = None
+        self._action_future: Optional[Future] = None
+        self._frame_buffer: Optional[Image.Image] = None
+
+        # Persistent `adb shell` session (None = not connected)
+        self._shell = None
+        self._shell_output = None
+        self._shell_lock = threading.Lock()
+
         # Verify ADB connection
         self._verify_adb_connection()
 
+        # Open one shell session reused by all device commands
+        self._open_shell()
+
         # Setup yadb for Chinese input
         self._setup_yadb()
 
     def _verify_adb_connection(self):
         """Verify ADB is installed and device is connected."""
         try:
-            # Check ADB installed
-            subprocess.run(
-                ["adb", "version"], capture_output=True, check=True, timeout=5
-            )
-
-            # Check device connected
+            # Check device connected (a missing adb binary raises
+            # FileNotFoundError here, so no separate `adb version` probe)
             result = subprocess.run(
                 ["adb", "devices"],
                 capture_output=True,
@@ -114,25 +154,492 @@ class LightGUIAgent:
 
         return subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
 
-    def capture_screenshot(self) -> Path:
+    def _open_shell(self):
+        """Start a persistent `adb shell` session.
+
+        Reusing one session avoids spawning an adb process and opening a new
+        connection to adbd for every action.
+        """
+        cmd = ["adb"]
+        if self.device_serial:
+            cmd.extend(["-s", self.device_serial])
+        cmd.append("shell")
+
+        try:
+            self._shell = subprocess.Popen(
+                cmd,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+            )
+        except OSError as e:
+            if self.verbose:
+                print(f"  ⚠️  Persistent adb shell unavailable: {e}")
+            self._shell = None
+            return
+
+        # Drain output on a background thread so reads can time out
+        self._shell_output = queue.Queue()
+        threading.Thread(
+            target=self._read_shell_output,
+            args=(self._shell.stdout, self._shell_output),
+            daemon=True,
+        ).start()
+
+    @staticmethod
+    def _read_shell_output(stream, output: queue.Queue):
+        """Forward shell output lines to a queue (None marks end of stream)."""
+        for line in iter(stream.readline, b""):
+            output.put(line)
+        output.put(None)
+
+    def _shell_run(self, command: str, timeout=10) -> subprocess.CompletedProcess:
+        """Run a command in the persistent shell session.
+
+        Args:
+            command: Shell command line to run on the device
+            timeout: Command timeout in seconds
+
+        Returns:
+            subprocess.CompletedProcess result
+
+        Raises:
+            RuntimeError: If the shell session is not usable
+            subprocess.TimeoutExpired: If the command doesn't finish in time
+        """
+        marker = "__DONE_"
+
+        with self._shell_lock:
+            if self._shell is None or self._shell.poll() is not None:
+                raise RuntimeError("adb shell session is not running")
+
+            if self.verbose:
+                print(f"  🔧 ADB shell: {command}")
+
+            try:
+                # The sentinel goes on its own line, so a trailing comment,
+                # `&` or unbalanced quote in the command can't swallow it
+                self._shell.stdin.write(f"{command}\necho {marker}$?\n".encode())
+                self._shell.stdin.flush()
+            except OSError as e:
+                self._close_shell()
+                raise RuntimeError(f"adb shell session closed: {e}")
+
+            output = []
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    line = self._shell_output.get(
+                        timeout=max(0, deadline - time.monotonic())
+                    )
+                except queue.Empty:
+                    # Session is out of sync now, start a fresh one next time
+                    self._close_shell()
+                    raise subprocess.TimeoutExpired(command, timeout)
+
+                if line is None:
+                    self._close_shell()
+                    raise RuntimeError("adb shell session closed")
+
+                text = line.decode("utf-8", errors="replace")
+                index = text.find(marker)
+                if index >= 0:
+                    output.append(text[:index])
+                    returncode = int(text[index + len(marker) :].strip() or 1)
+                    break
+                output.append(text)
+
+        return subprocess.CompletedProcess(command, returncode, "".join(output), "")
+
+    def _shell_command(self, *args, timeout=10) -> subprocess.CompletedProcess:
+        """Execute a device shell command, reusing the persistent session.
+
+        Falls back to a one-off `adb shell` call if the session is unavailable.
+
+        Args:
+            *args: Shell command arguments (joined with spaces, like `adb shell`)
+            timeout: Command timeout in seconds
+
+        Returns:
+            subprocess.CompletedProcess result
+        """
+        if self._shell is None:
+            self._open_shell()
+
+        if self._shell is not None:
+            try:
+                return self._shell_run(" ".join(args), timeout=timeout)
+            except RuntimeError as e:
+                if self.verbose:
+                    print(f"  ⚠️  {e}, falling back to adb shell")
+
+        return self._adb_command("shell", *args, timeout=timeout)
+
+    def close(self):
+        """Close the persistent adb shell session and capture worker."""
+        executor = getattr(self, "_executor", None)
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        self._close_shell()
+
+    def _close_shell(self):
+        """Close the persistent adb shell session (the next command reopens it)."""
+        shell, self._shell = getattr(self, "_shell", None), None
+        if shell is None:
+            return
+
+        try:
+            shell.stdin.write(b"exit\n")
+            shell.stdin.close()
+            shell.wait(timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            shell.kill()
+
+    def __del__(self):
+        self.close()
+
+    def _adb_exec_out(self, *args, timeout=10) -> bytes:
+        """Execute ADB exec-out command and return raw stdout.
+
+        Unlike `adb shell`, exec-out streams binary output untouched, so
+        image data can be read straight from the pipe.
+
+        Args:
+            *args: Command to run on the device
+            timeout: Command timeout in seconds
+
+        Returns:
+            Raw stdout bytes
+
+        Raises:
+            RuntimeError: If the command failed or produced no output (e.g.
+                the device disconnected), as opposed to unexpected output
+        """
+        cmd = ["adb"]
+        if self.device_serial:
+            cmd.extend(["-s", self.device_serial])
+        cmd.append("exec-out")
+        cmd.extend(args)
+
+        if self.verbose:
+            print(f"  🔧 ADB: {' '.join(cmd)}")
+
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+        if result.returncode != 0 or not result.stdout:
+            error = result.stderr.decode("utf-8", errors="replace").strip()
+            raise RuntimeError(
+                f"adb exec-out {' '.join(args)} failed "
+                f"(exit {result.returncode}): {error or 'no output'}"
+            )
+        return result.stdout
+
+    def capture_screenshot(self, out: Optional[Image.Image] = None) -> Image.Image:
         """Capture screenshot from device.
 
+        Uses the raw framebuffer when enabled. If the device returns an
+        unexpected raw layout, PNG capture is used from then on; if the raw
+        read itself fails (a transient adb error), only this frame falls
+        back to PNG.
+
+        Args:
+            out: Optional RGB image to decode a raw capture into (see
+                capture_screenshot_raw)
+
         Returns:
-            Path to local screenshot file
+            PIL Image of the current screen
         """
-        # Capture screenshot on device
-        self._adb_command("shell", "screencap", "-p", self.screenshot_path)
+        if self.raw_screencap:
+            try:
+                return self.capture_screenshot_raw(out=out)
+            except RuntimeError as e:
+                print(f"⚠️  Raw screencap failed ({e}), retrying as PNG")
+            except ValueError as e:
+                print(f"⚠️  Raw screencap unsupported ({e}), falling back to PNG")
+                self.raw_screencap = False
 
-        # Pull to local
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        local_path = ADB_CONFIG["local_screenshot_dir"] / f"screenshot_{timestamp}.png"
+        return self.capture_screenshot_png()
+
+    def capture_screenshot_raw(self, out: Optional[Image.Image] = None) -> Image.Image:
+        """Capture screenshot as a raw RGBA framebuffer.
+
+        Skips the on-device PNG encoding done by `screencap -p`. The output
+        starts with a little-endian header (width, height, pixel format, and
+        on Android 10+ a color space field) followed by width*height*4 bytes.
+
+        Args:
+            out: Optional RGB image to decode into. It is reused (and
+                returned) when its size matches the frame, which avoids
+                allocating a new full-resolution image per capture
+
+        Returns:
+            PIL Image of the current screen
+
+        Raises:
+            ValueError: If the raw output doesn't match the expected layout
+            RuntimeError: If the screencap command failed (see _adb_exec_out)
+        """
+        data = self._adb_exec_out("screencap")
+        if len(data) < 12:
+            raise ValueError("truncated raw screencap header")
+
+        width, height, pixel_format = struct.unpack_from("<III", data)
+        header_size = len(data) - width * height * 4
+
+        # 1 = RGBA_8888, 2 = RGBX_8888
+        if pixel_format not in (1, 2) or header_size not in (12, 16):
+            raise ValueError(
+                f"unexpected raw layout {width}x{height} format={pixel_format}"
+            )
+
+        # Decode straight to RGB, dropping the alpha byte of every pixel
+        if out is None or out.mode != "RGB" or out.size != (width, height):
+            out = Image.new("RGB", (width, height))
+        out.frombytes(memoryview(data)[header_size:], "raw", "RGBX", 0, 1)
+
+        return out
+
+    def capture_screenshot_png(self) -> Image.Image:
+        """Capture screenshot as PNG.
+
+        The PNG is streamed through `adb exec-out`, so nothing is written to
+        the device filesystem or pulled back as a file.
+
+        Returns:
+            PIL Image of the current screen
+        """
+        try:
+            png_bytes = self._adb_exec_out("screencap", "-p")
+        except RuntimeError as e:
+            raise Exception(f"Failed to capture screenshot: {e}") from e
+
+        screenshot = Image.open(io.BytesIO(png_bytes))
+        screenshot.load()
+
+        return screenshot
+
+    def _configure_grid(self, screen_width: int, screen_height: int):
+        """Build and switch to the grid for a screen size.
+
+        Args:
+            screen_width: Device screen width in pixels
+            screen_height: Device screen height in pixels
+        """
+        self._apply_grid(self._build_grid(screen_width, screen_height))
+
+    def _apply_grid(self, grid: dict):
+        """Switch to a grid built by _build_grid.
+
+        Only called on the main thread, between steps, so an action never
+        resolves a cell against a grid that changed mid-step.
+        """
+        self.screen_size = grid["screen_size"]
+        self.grid_converter = grid["grid_converter"]
+        self.canvas_size = grid["canvas_size"]
+        self.grid_overlay = grid["grid_overlay"]
+
+    @staticmethod
+    def _build_grid(screen_width: int, screen_height: int) -> dict:
+        """Build the grid converter and overlay for a screen size.
+
+        Called at startup and again whenever a screenshot comes back with a
+        different size (e.g. after a rotation). Doesn't touch the agent, so
+        the capture worker can build a grid while a step is still running.
+
+        Args:
+            screen_width: Device screen width in pixels
+            screen_height: Device screen height in pixels
+
+        Returns:
+            Dict with screen_size, grid_converter, canvas_size, grid_overlay
+        """
+        device_config = dict(GRID_CONFIG)
+        device_config["screen_width"] = screen_width
+        device_config["screen_height"] = screen_height
+        device_config["cell_width"] = screen_width / device_config["grid_cols"]
+        device_config["cell_height"] = screen_height / device_config["grid_rows"]
+
+        grid_converter = GridConverter(config=device_config)
+
+        # Screenshots are downscaled to a smaller canvas before the overlay is
+        # drawn; taps still go through grid_converter in device pixels
+        long_edge = AGENT_CONFIG["screenshot_long_edge"]
+        screen_size = (screen_width, screen_height)
+        scale = min(1.0, long_edge / max(screen_size)) if long_edge else 1.0
+        canvas_config = scale_grid_config(device_config, scale)
+
+        return {
+            "screen_size": screen_size,
+            "grid_converter": grid_converter,
+            "canvas_size": (
+                canvas_config["screen_width"],
+                canvas_config["screen_height"],
+            ),
+            "grid_overlay": GridOverlay(config=canvas_config),
+        }
+
+    def _wait_for_stable(self, max_wait: float) -> Image.Image:
+        """Capture frames until the screen stops changing.
+
+        Compares reduced copies of consecutive captures and returns once
+        STABLE_PAIRS pairs in a row match, so fast transitions don't pay the
+        full delay. A single still pair isn't enough: loading screens often
+        hold still for a moment before the content arrives.
+
+        Args:
+            max_wait: Upper bound in seconds (the configured delay_after_action)
+
+        Returns:
+            The last captured frame
+        """
+        deadline = time.monotonic() + max_wait
+        time.sleep(min(STABLE_MIN_WAIT, max_wait))
+
+        previous_probe = None
+        stable_pairs = 0
+        while True:
+            frame = self.capture_screenshot(out=self._frame_buffer)
+            self._frame_buffer = frame
+            probe = frame.reduce(STABLE_PROBE_FACTOR)
+
+            if previous_probe is not None and probe.size == previous_probe.size:
+                diff = ImageStat.Stat(ImageChops.difference(probe, previous_probe))
+                still = max(diff.mean) < STABLE_THRESHOLD
+            else:
+                still = False
+
+            stable_pairs = stable_pairs + 1 if still else 0
+            if stable_pairs >= STABLE_PAIRS:
+                if self.verbose:
+                    waited = max_wait - (deadline - time.monotonic())
+                    print(f"  ⏱️  Screen settled after {waited:.2f}s")
+                return frame
+
+            if time.monotonic() + STABLE_POLL_INTERVAL >= deadline:
+                return frame
+
+            previous_probe = probe
+            time.sleep(STABLE_POLL_INTERVAL)
+
+    def _capture_and_annotate(
+        self, delay: float = 0.0, adaptive: bool = True
+    ) -> tuple[
+        Image.Image, Image.Image, memoryview, str, Optional[str], Optional[dict]
+    ]:
+        """Wait for the UI to settle, then capture and annotate a screenshot.
+
+        Runs on the capture worker so it overlaps with the bookkeeping that
+        follows an action. It never changes the agent's grid: if the screen
+        size changed, the new grid is returned for run_task to switch to.
 
-        self._adb_command("pull", self.screenshot_path, str(local_path))
+        Args:
+            delay: Seconds to wait before capturing
+            adaptive: Allow capturing early once the screen settles (when the
+                adaptive_delay config is on); False always waits the full delay
+
+        Returns:
+            (screenshot, annotated_image, grid_image_jpeg, grid_image_b64,
+            ui_tree, new_grid), where new_grid is a _build_grid dict or None
+        """
+        # The full-resolution frame is only an intermediate on the way to the
+        # downscaled canvas, so decode every capture into the same buffer
+        if delay and adaptive and AGENT_CONFIG["adaptive_delay"]:
+            screenshot = self._wait_for_stable(delay)
+        else:
+            if delay:
+                time.sleep(delay)
+            screenshot = self.capture_screenshot(out=self._frame_buffer)
+            self._frame_buffer = screenshot
+
+        new_grid = None
+        grid_overlay = self.grid_overlay
+        grid_converter = self.grid_converter
+        canvas_size = self.canvas_size
+        if screenshot.size != self.screen_size:
+            if self.verbose:
+                print(
+                    f"  🔄 Screen size changed to {screenshot.width}x{screenshot.height}"
+                )
+            new_grid = self._build_grid(*screenshot.size)
+            grid_overlay = new_grid["grid_overlay"]
+            grid_converter = new_grid["grid_converter"]
+            canvas_size = new_grid["canvas_size"]
+
+        if screenshot.size != canvas_size:
+            screenshot = grid_overlay.resize(screenshot, canvas_size)
+        else:
+            # The caller keeps this frame, so it can't double as the buffer
+            self._frame_buffer = None
+
+        # Add grid overlay and encode it once; the same JPEG bytes go to
+        # Claude (as base64) and, when saving screenshots, to the task log
+        # Unless the raw frame is saved, the grid can go straight onto it
+        annotated_image = grid_overlay.apply(
+            screenshot, in_place=not self._keep_raw_frames
+        )
+        grid_image_jpeg = grid_overlay.compress(annotated_image)
+        grid_image_b64 = base64.b64encode(grid_image_jpeg).decode("ascii")
+
+        ui_tree = (
+            self._dump_ui_tree(grid_converter) if AGENT_CONFIG["ui_tree"] else None
+        )
+
+        return (
+            screenshot,
+            annotated_image,
+            grid_image_jpeg,
+            grid_image_b64,
+            ui_tree,
+            new_grid,
+        )
+
+    def _dump_ui_tree(self, grid_converter: GridConverter) -> Optional[str]:
+        """Dump the accessibility tree as compact, grid-labelled text.
+
+        Only elements with text or a content description are kept, one per
+        line, e.g. 'E5: "Search" (clickable)'.
+
+        Args:
+            grid_converter: Converter for the screen the tree was dumped from
+
+        Returns:
+            The tree text, or None if the dump failed, found nothing, or is
+            longer than ui_tree_max_chars (then the screenshot is cheaper)
+        """
+        try:
+            xml = self._adb_exec_out("uiautomator", "dump", "/dev/tty", timeout=10)
+        except (subprocess.TimeoutExpired, RuntimeError):
+            return None
+
+        # The XML is followed by a "UI hierchary dumped to: /dev/tty" line
+        start = xml.find(b"<?xml")
+        end = xml.rfind(b"</hierarchy>")
+        if start < 0 or end < 0:
+            return None
+
+        try:
+            root = ElementTree.fromstring(xml[start : end + len(b"</hierarchy>")])
+        except ElementTree.ParseError:
+            return None
 
-        if not local_path.exists():
-            raise Exception(f"Failed to pull screenshot to {local_path}")
+        lines = []
+        for node in root.iter("node"):
+            label = node.get("text") or node.get("content-desc")
+            bounds = UI_BOUNDS_RE.fullmatch(node.get("bounds", ""))
+            if not label or not label.strip() or not bounds:
+                continue
 
-        return local_path
+            x1, y1, x2, y2 = map(int, bounds.groups())
+            grid = grid_converter.pixel_to_grid((x1 + x2) // 2, (y1 + y2) // 2)
+            label = " ".join(label.split())
+            clickable = " (clickable)" if node.get("clickable") == "true" else ""
+            lines.append(f'{grid}: "{label}"{clickable}')
+
+        ui_tree = "\n".join(lines)
+        if not ui_tree or len(ui_tree) > AGENT_CONFIG["ui_tree_max_chars"]:
+            return None
+
+        return ui_tree
 
     def _clear_text_field(self):
         """Clear current focused text field using Ctrl+A + Delete.
@@ -144,15 +651,13 @@ class LightGUIAgent:
             print("  Clearing text field: Ctrl+A + Delete")
 
             # Method 1: Use keycombination (most reliable)
-            self._adb_command(
-                "shell", "input", "keycombination", "113", "29", timeout=2
-            )
+            self._shell_command("input", "keycombination", "113", "29", timeout=2)
 
             # Small delay
             time.sleep(0.2)
 
             # Delete selected text: KEYCODE_DEL (67)
-            self._adb_command("shell", "input", "keyevent", "67", timeout=2)
+            self._shell_command("input", "keyevent", "67", timeout=2)
 
             time.sleep(0.2)
 
@@ -160,15 +665,29 @@ class LightGUIAgent:
             if self.verbose:
                 print(f"  ⚠️  Clear text failed: {e}")
 
-    def execute_action(self, action: dict, retry_on_failure: bool = True):
+    def execute_action(
+        self, action: dict, retry_on_failure: bool = True, wait: bool = True
+    ):
         """Execute an action on the device.
 
         Args:
             action: Action dict from Claude
             retry_on_failure: Whether to retry on failure
+            wait: Block until SCROLL finishes. When False the swipe (with
+                the same retries) runs on the capture worker, so the next
+                capture queues behind it
         """
         action_type = action["action"]
 
+        if action_type == "SCROLL" and not wait:
+            # `input swipe` blocks for the whole gesture; let it play out in
+            # the background. Errors surface when run_task collects the next
+            # capture
+            self._action_future = self._executor.submit(
+                self.execute_action, action, retry_on_failure
+            )
+            return
+
         max_retries = 2 if retry_on_failure else 1
 
         for attempt in range(max_retries):
@@ -177,10 +696,11 @@ class LightGUIAgent:
                     grid = action["grid"]
                     x, y = self.grid_converter.grid_to_pixel(grid)
 
-                    print(
-                        f"Executing command: adb -s {self.device_serial or 'default'} shell input tap {x} {y}"
-                    )
-                    self._adb_command("shell", "input", "tap", str(x), str(y))
+                    if self.verbose:
+                        print(
+                            f"Executing command: adb -s {self.device_serial or 'default'} shell input tap {x} {y}"
+                        )
+                    self._shell_command("input", "tap", str(x), str(y))
 
                 elif action_type == "TYPE":
                     value = action["value"]
@@ -196,33 +716,34 @@ class LightGUIAgent:
                         processed_text = value.replace("\n", " ").replace("\t", " ")
 
                         cmd_parts = [
-                            "shell",
                             "app_process",
                             "-Djava.class.path=/data/local/tmp/yadb",
                             "/data/local/tmp",
                             "com.ysbing.yadb.Main",
                             "-keyboard",
-                            f'"{processed_text}"',
+                            shlex.quote(processed_text),
                         ]
 
-                        print(
-                            f"Executing command (yadb): adb shell app_process ... -keyboard '{value}'"
-                        )
-                        self._adb_command(*cmd_parts)
+                        if self.verbose:
+                            print(
+                                f"Executing command (yadb): adb shell app_process ... -keyboard '{value}'"
+                            )
+                        self._shell_command(*cmd_parts)
                     else:
                         # Fallback to basic input text (doesn't support Chinese well)
-                        # Escape special characters and spaces
-                        escaped_value = value.replace(" ", "%s").replace("'", "\\'")
+                        # `input text` reads %s as a space; quote the rest so
+                        # the device shell passes it through literally
+                        escaped_value = shlex.quote(value.replace(" ", "%s"))
 
-                        print(f"Executing command: adb shell input text '{value}'")
-                        self._adb_command("shell", "input", "text", escaped_value)
+                        if self.verbose:
+                            print(f"Executing command: adb shell input text '{value}'")
+                        self._shell_command("input", "text", escaped_value)
 
                 elif action_type == "SCROLL":
                     direction = action["value"]  # "up" or "down"
 
                     # Calculate swipe coordinates (middle of screen horizontally)
-                    screen_width = GRID_CONFIG["screen_width"]
-                    screen_height = GRID_CONFIG["screen_height"]
+                    screen_width, screen_height = self.screen_size
                     x = screen_width // 2
 
                     if direction == "down":
@@ -236,11 +757,11 @@ class LightGUIAgent:
 
                     duration = 300  # milliseconds
 
-                    print(
-                        f"Executing command: adb shell input swipe {x} {y1} {x} {y2} {duration}"
-                    )
-                    self._adb_command(
-                        "shell",
+                    if self.verbose:
+                        print(
+                            f"Executing command: adb shell input swipe {x} {y1} {x} {y2} {duration}"
+                        )
+                    swipe_args = (
                         "input",
                         "swipe",
                         str(x),
@@ -249,28 +770,21 @@ class LightGUIAgent:
                         str(y2),
                         str(duration),
                     )
+                    self._shell_command(*swipe_args)
 
                 elif action_type == "AWAKE":
                     package = action["value"]
 
-                    # First force stop the app
-                    print(f"Executing command: adb shell am force-stop {package}")
-                    self._adb_command("shell", "am", "force-stop", package)
-                    time.sleep(0.5)
-
-                    # Then launch it
-                    print(
-                        f"Executing command: adb shell monkey -p {package} -c android.intent.category.LAUNCHER 1"
-                    )
-                    self._adb_command(
-                        "shell",
-                        "monkey",
-                        "-p",
-                        package,
-                        "-c",
-                        "android.intent.category.LAUNCHER",
-                        "1",
+                    # Force stop then relaunch the app in one shell round-trip
+                    package = shlex.quote(package)
+                    command = (
+                        f"am force-stop {package}; sleep 0.3; "
+                        f"monkey -p {package} -c android.intent.category.LAUNCHER 1"
+                        " >/dev/null 2>&1"
                     )
+                    if self.verbose:
+                        print(f"Executing command: adb shell {command}")
+                    self._shell_command(command)
 
                 elif action_type == "COMPLETE":
                     if self.verbose:
@@ -296,9 +810,7 @@ class LightGUIAgent:
         """Setup yadb tool for Chinese input support."""
         try:
             # Check if yadb already exists on device
-            result = self._adb_command(
-                "shell", "md5sum", "/data/local/tmp/yadb", timeout=5
-            )
+            result = self._shell_command("md5sum", "/data/local/tmp/yadb", timeout=5)
 
             if result.returncode == 0:
                 if self.verbose:
@@ -357,7 +869,7 @@ class LightGUIAgent:
         log_dir = LOGS_DIR / f"task_{timestamp}"
         image_dir = log_dir / "images"
 
-        self.logger = TaskLogger(log_dir=log_dir, image_dir=image_dir)
+        self.logger = ThreadedTaskLogger(log_dir=log_dir, image_dir=image_dir)
 
         print("=" * 60)
         print("🚀 Grid-Claude-Agent Starting")
@@ -367,25 +879,26 @@ class LightGUIAgent:
         print(f"📁 Log: {self.logger.log_file}")
         print()
 
-        # Clean up old temporary screenshots
-        screenshot_dir = ADB_CONFIG["local_screenshot_dir"]
-        if screenshot_dir.exists():
-            for old_screenshot in screenshot_dir.glob("screenshot_*.png"):
-                try:
-                    old_screenshot.unlink()
-                except Exception:
-                    pass
+        # Reset the local screenshot dir; it only holds debug artifacts now
+        if save_screenshots:
+            screenshot_dir = ADB_CONFIG["local_screenshot_dir"]
+            shutil.rmtree(screenshot_dir, ignore_errors=True)
+            screenshot_dir.mkdir(parents=True, exist_ok=True)
 
         # Reset state
         self.history = []
         self.step_count = 0
-        self.step_times = []
+        self.step_times = array("d")
+        self._keep_raw_frames = save_screenshots
         start_time = time.time()
 
         # Log task start
         self.logger.log_task_start(task, {"max_steps": max_steps})
 
         try:
+            # Capture the first screenshot; later ones are queued after each action
+            self._capture_future = self._executor.submit(self._capture_and_annotate)
+
             for step in range(1, max_steps + 1):
                 step_start = time.time()
                 self.step_count = step
@@ -393,35 +906,48 @@ class LightGUIAgent:
                 # Log step start
                 self.logger.log_step_start(step)
 
-                # 1. Capture screenshot
-                screenshot_path = self.capture_screenshot()
-
-                # 2. Add grid overlay (don't save to DEBUG_DIR, only save via logger)
-                annotated_image, grid_image_b64 = self.grid_overlay.process_screenshot(
-                    screenshot_path, save_path=None
-                )
-
-                # Log screenshot path
-                self.logger.log_screenshot(step, str(screenshot_path))
+                # Surface errors from a swipe that ran in the background
+                if self._action_future is not None:
+                    action_future, self._action_future = self._action_future, None
+                    action_future.result()
+
+                # 1-2. Collect the screenshot with grid overlay
+                (
+                    screenshot,
+                    annotated_image,
+                    grid_image_jpeg,
+                    grid_image_b64,
+                    ui_tree,
+                    new_grid,
+                ) = self._capture_future.result()
+                self._capture_future = None
+
+                # The screen size changed (e.g. rotation): switch grids now,
+                # between steps, so this step's action uses the grid Claude sees
+                if new_grid is not None:
+                    self._apply_grid(new_grid)
+
+                # Save raw and annotated images to logger's image directory (only location)
+                if save_screenshots:
+                    screenshot_path = self.logger.save_image(
+                        screenshot, step, "screenshot"
+                    )
+                    self.logger.log_screenshot(step, screenshot_path)
 
-                # Save annotated image to logger's image directory (only location)
                 if save_screenshots and annotated_image:
-                    saved_path = self.logger.save_image(
-                        annotated_image, step, "annotated"
+                    saved_path = self.logger.save_image_bytes(
+                        grid_image_jpeg, step, "annotated"
                     )
                     if self.verbose:
                         print(f"  💾 Saved: {saved_path}")
 
-                # Clean up temporary original screenshot (not needed after processing)
-                try:
-                    screenshot_path.unlink()
-                except Exception:
-                    pass  # Ignore cleanup errors
-
                 # 3. Get action from Claude
                 llm_start = time.time()
                 action = self.claude.get_action(
-                    task=task, grid_image_b64=grid_image_b64, history=self.history
+                    task=task,
+                    grid_image_b64=grid_image_b64,
+                    history=self.history,
+                    ui_tree=ui_tree,
                 )
                 llm_time = time.time() - llm_start
 
@@ -431,38 +957,56 @@ class LightGUIAgent:
                 tokens = {
                     "input": self.claude.total_input_tokens,
                     "output": self.claude.total_output_tokens,
+                    "cache_read": self.claude.total_cache_read_tokens,
+                    "cache_write": self.claude.total_cache_write_tokens,
                 }
                 self.logger.log_llm_response(step, action, llm_time, tokens)
 
                 # 4. Execute action
                 try:
                     action_start = time.time()
-                    self.execute_action(action)
+                    self.execute_action(action, wait=False)
                     action_time = time.time() - action_start
 
                     # Log successful action
                     self.logger.log_action_execution(step, action, action_time)
 
-                    # Create and save marked image showing the action
-                    marked_image_b64 = None
-                    if save_screenshots and annotated_image and action["action"] in [
-                        "CLICK",
-                        "TYPE",
-                        "AWAKE",
-                    ]:
-                        marked_image = self.grid_overlay.mark_action(
-                            annotated_image, action
-                        )
-                        marked_path = self.logger.save_image(
-                            marked_image, step, "action_marked"
+                    # Start capturing the next screen once the UI has settled.
+                    # AWAKE returns as soon as the launch intent is sent, and
+                    # a cold start can sit on a still splash screen, so it
+                    # always waits the full delay
+                    if action["action"] != "COMPLETE":
+                        self._capture_future = self._executor.submit(
+                            self._capture_and_annotate,
+                            AGENT_CONFIG["delay_after_action"],
+                            adaptive=action["action"] != "AWAKE",
                         )
-                        if self.verbose:
-                            print(f"  ✓ Action marked: {marked_path}")
 
-                        # Compress and encode marked image for history
-                        marked_image_b64 = self.grid_overlay.compress_and_encode(
-                            marked_image
-                        )
+                    # History reuses the already-encoded grid screenshot; the
+                    # action is described in text instead of drawn
+                    previous_screenshot = None
+                    if action["action"] in ["CLICK", "TYPE", "AWAKE"]:
+                        previous_screenshot = {
+                            "image_b64": grid_image_b64,
+                            "media_type": "image/jpeg",
+                            "marker": {
+                                "type": action["action"],
+                                "target": action.get("grid") or action.get("value", ""),
+                            },
+                        }
+
+                        # Save a marked image showing the action. The annotated
+                        # frame is already encoded and isn't used again, so the
+                        # marker can go straight onto it
+                        if save_screenshots and annotated_image:
+                            marked_image = self.grid_overlay.mark_action(
+                                annotated_image, action, in_place=True
+                            )
+                            marked_path = self.logger.save_image(
+                                marked_image, step, "action_marked"
+                            )
+                            if self.verbose:
+                                print(f"  ✓ Action marked: {marked_path}")
 
                 except Exception as e:
                     # Log error
@@ -480,23 +1024,28 @@ class LightGUIAgent:
                 # 6. Print step summary
                 self._print_step_summary(step, max_steps, action)
 
-                # 7. Record in history with marked screenshot
-                history_entry = action.copy()
-                if marked_image_b64:
-                    history_entry["marked_screenshot_b64"] = marked_image_b64
-
-                self.history.append(history_entry)
-
-                # 8. Check if complete
+                # 7. Check if complete; no later step sends this entry to
+                # Claude, so record it as-is for the success check and stop
                 if action["action"] == "COMPLETE":
+                    self.history.append(action)
                     print(f"\n{'═' * 60}")
                     print("✅ Task Completed Successfully!")
                     print(f"{'═' * 60}")
                     break
 
-                # 9. Wait before next step
-                delay = AGENT_CONFIG["delay_after_action"]
-                time.sleep(delay)
+                # 8. Record in history with marked screenshot
+                history_entry = action.copy()
+                if previous_screenshot:
+                    history_entry["previous_screenshot"] = previous_screenshot
+
+                self.history.append(history_entry)
+
+                # Drop screenshots that fell out of the recent-image window;
+                # the action fields stay for reasoning continuity
+                image_window = AGENT_CONFIG["history_image_window"]
+                if len(self.history) > image_window:
+                    expired_entry = self.history[-image_window - 1]
+                    expired_entry.pop("previous_screenshot", None)
 
             else:
                 # Max steps reached
@@ -510,17 +1059,24 @@ class LightGUIAgent:
 
         except Exception as e:
             print(f"\n\n❌ Error: {e}")
-            import traceback
 
-            error_traceback = traceback.format_exc()
-            print(error_traceback)
+            # Only format the full traceback when someone is going to read it
+            error_data = {"error": f"{type(e).__name__}: {e}"}
+            if self.verbose:
+                error_traceback = traceback.format_exc()
+                print(error_traceback)
+                error_data["traceback"] = error_traceback
 
             # Log error
-            self.logger.log_event(
-                "task_error", {"error": str(e), "traceback": error_traceback}
-            )
+            self.logger.log_event("task_error", error_data)
 
         finally:
+            # Drop any capture queued for a step that won't run
+            if self._capture_future is not None:
+                self._capture_future.cancel()
+                self._capture_future = None
+            self._action_future = None
+
             # Print summary
             elapsed_time = time.time() - start_time
             self._print_summary(elapsed_time)
@@ -544,6 +1100,8 @@ class LightGUIAgent:
                 print(f"   Total steps: {summary.get('total_steps', 0)}")
                 print(f"   Log file: {self.logger.log_file}")
 
+            self.logger.close()
+
         # Return results
         return {
             "success": len(self.history) > 0
@@ -603,6 +1161,13 @@ class LightGUIAgent:
                 print(f"Fastest step:    {min_time:.1f}s")
                 print(f"Slowest step:    {max_time:.1f}s")
 
+                if len(self.step_times) >= 2:
+                    percentiles = statistics.quantiles(
+                        self.step_times, n=100, method="inclusive"
+                    )
+                    p50, p95, p99 = percentiles[49], percentiles[94], percentiles[98]
+                    print(f"Step p50/p95/p99: {p50:.1f}s / {p95:.1f}s / {p99:.1f}s")
+
         print(f"Total execution time: {elapsed_time:.1f}s")
 
         # Print cost summary
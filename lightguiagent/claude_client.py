@@ -3,12 +3,162 @@
 Handles communication with Claude Opus 4.5 API for vision-based action decisions.
 """
 
-import json
+import asyncio
+import random
+import re
 import time
-from typing import Optional
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Annotated,
+    Callable,
+    ClassVar,
+    Literal,
+    NotRequired,
+    Optional,
+    TypedDict,
+    Union,
+)
 
-from anthropic import Anthropic
-from lightguiagent.config import CLAUDE_CONFIG, ACTION_TYPES, PRICING
+from pydantic import ConfigDict, Field, TypeAdapter, ValidationError, with_config
+from lightguiagent.config import CLAUDE_CONFIG, PRICING
+
+# The anthropic SDK (and its HTTP stack) is imported on first use, so code
+# that only needs the grid or config modules doesn't pay for it
+if TYPE_CHECKING:
+    from anthropic import AsyncAnthropic, DefaultHttpxClient
+
+# A whole response wrapped in a markdown code fence (```json ... ```)
+_FENCE_RE = re.compile(r"^```[\w-]*[ \t]*\n(.*?)\n?```$", re.DOTALL)
+
+
+# Response schema, one shape per action type; "action" picks the shape.
+# Extra keys (explain, summary, ...) are kept as-is
+@with_config(ConfigDict(extra="allow"))
+class _ClickAction(TypedDict):
+    action: Literal["CLICK"]
+    grid: str
+
+
+@with_config(ConfigDict(extra="allow"))
+class _TypeAction(TypedDict):
+    action: Literal["TYPE"]
+    value: str
+    clear_first: NotRequired[bool]
+
+
+@with_config(ConfigDict(extra="allow"))
+class _ScrollAction(TypedDict):
+    action: Literal["SCROLL"]
+    value: Literal["up", "down"]
+
+
+@with_config(ConfigDict(extra="allow"))
+class _AwakeAction(TypedDict):
+    action: Literal["AWAKE"]
+    value: str
+
+
+@with_config(ConfigDict(extra="allow"))
+class _CompleteAction(TypedDict):
+    action: Literal["COMPLETE"]
+
+
+_Action = Annotated[
+    Union[_ClickAction, _TypeAction, _ScrollAction, _AwakeAction, _CompleteAction],
+    Field(discriminator="action"),
+]
+
+
+@lru_cache(maxsize=1)
+def _action_adapter() -> TypeAdapter:
+    """Compiled validator for _Action, built on first use."""
+    return TypeAdapter(_Action)
+
+
+# Retry backoff: RETRY_INITIAL * 2**attempt seconds plus up to RETRY_JITTER
+# of random jitter, capped at RETRY_MAX (a server retry-after is used as-is)
+RETRY_INITIAL = 0.5
+RETRY_MAX = 16.0
+RETRY_JITTER = 1.0
+
+
+@lru_cache(maxsize=1)
+def _shared_http_client() -> "DefaultHttpxClient":
+    """HTTP client shared by every ClaudeClient in the process.
+
+    Each Anthropic() otherwise opens its own connection pool, so a new
+    ClaudeClient per run would pay a fresh TCP + TLS handshake; sharing one
+    keeps the connection to the API alive between runs.
+    """
+    from anthropic import DefaultHttpxClient
+
+    return DefaultHttpxClient()
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Check whether an API error is transient (rate limit, network, 5xx/overloaded).
+
+    Bad requests, auth errors and unparseable responses would fail the same
+    way again, so they are not retried.
+    """
+    from anthropic import APIConnectionError, APIStatusError, RateLimitError
+
+    if isinstance(error, (RateLimitError, APIConnectionError)):
+        return True
+    return isinstance(error, APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(attempt: int, error: Exception) -> float:
+    """Seconds to wait before the next attempt.
+
+    Uses the server's retry-after header when present (uncapped: retrying
+    sooner would only be rejected again), otherwise exponential backoff with
+    jitter.
+    """
+    response = getattr(error, "response", None)
+    if response is not None:
+        headers = response.headers
+        try:
+            if "retry-after-ms" in headers:
+                return float(headers["retry-after-ms"]) / 1000
+            if "retry-after" in headers:
+                return float(headers["retry-after"])
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+
+    backoff = RETRY_INITIAL * 2**attempt + random.uniform(0, RETRY_JITTER)
+    return min(backoff, RETRY_MAX)
+
+
+# History line formatters, keyed by action type
+def _format_click(action: dict, i: int) -> str:
+    return f"{i}. CLICK {action.get('grid', '')} - {action.get('explain', '')}\n"
+
+
+def _format_type(action: dict, i: int) -> str:
+    return f'{i}. TYPE "{action.get("value", "")}" - {action.get("explain", "")}\n'
+
+
+def _format_scroll(action: dict, i: int) -> str:
+    return f"{i}. SCROLL {action.get('value', '')} - {action.get('explain', '')}\n"
+
+
+def _format_awake(action: dict, i: int) -> str:
+    return f"{i}. AWAKE {action.get('value', '')} - {action.get('explain', '')}\n"
+
+
+def _format_generic(action: dict, i: int) -> str:
+    action_type = action.get("action", "UNKNOWN")
+    return f"{i}. {action_type} - {action.get('explain', '')}\n"
+
+
+_ACTION_FORMATTERS: dict[str, Callable[[dict, int], str]] = {
+    "CLICK": _format_click,
+    "TYPE": _format_type,
+    "SCROLL": _format_scroll,
+    "AWAKE": _format_awake,
+}
 
 
 class ClaudeClient:
@@ -162,35 +312,67 @@ IMPORTANT: Your "explain" and "summary" fields MUST match the language of the us
 - 支付宝: com.eg.android.AlipayGphone
 """
 
-    def __init__(self, api_key: Optional[str] = None, model: Optional[str] = None):
+    # System prompt as a cache-marked content block (see _build_system)
+    SYSTEM_BLOCKS: ClassVar[list[dict]] = [
+        {
+            "type": "text",
+            "text": SYSTEM_PROMPT,
+            "cache_control": {"type": "ephemeral"},
+        }
+    ]
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        model: Optional[str] = None,
+        prompt_caching: Optional[bool] = None,
+    ):
         """Initialize Claude client.
 
         Args:
             api_key: Claude API key, defaults to config
             model: Model name, defaults to config
+            prompt_caching: Mark the system prompt for prompt caching, defaults to config
         """
         self.api_key = api_key or CLAUDE_CONFIG["api_key"]
         self.model = model or CLAUDE_CONFIG["model"]
+        self.prompt_caching = (
+            prompt_caching
+            if prompt_caching is not None
+            else CLAUDE_CONFIG["prompt_caching"]
+        )
 
         if not self.api_key:
             raise ValueError(
                 "Anthropic API key is required. Set ANTHROPIC_API_KEY environment variable."
             )
 
-        self.client = Anthropic(api_key=self.api_key)
+        from anthropic import Anthropic
+
+        self.client = Anthropic(api_key=self.api_key, http_client=_shared_http_client())
+        self._aclient = None  # AsyncAnthropic, created by aget_action
         self.max_tokens = CLAUDE_CONFIG["max_tokens"]
         self.temperature = CLAUDE_CONFIG["temperature"]
 
-        # Cost tracking
+        # Cost tracking (input excludes tokens read from / written to cache)
         self.total_input_tokens = 0
         self.total_output_tokens = 0
+        self.total_cache_read_tokens = 0
+        self.total_cache_write_tokens = 0
+
+        # Per-token prices in USD, resolved once
+        self._price_input = PRICING["input_per_million"] / 1_000_000
+        self._price_output = PRICING["output_per_million"] / 1_000_000
+        self._price_cache_read = PRICING["cache_read_per_million"] / 1_000_000
+        self._price_cache_write = PRICING["cache_write_per_million"] / 1_000_000
 
     def get_action(
         self,
         task: str,
         grid_image_b64: str,
         history: Optional[list] = None,
-        max_retries: int = 3,
+        max_retries: int = 2,
+        ui_tree: Optional[str] = None,
     ) -> dict:
         """Get next action from Claude based on current screenshot.
 
@@ -198,53 +380,249 @@ IMPORTANT: Your "explain" and "summary" fields MUST match the language of the us
             task: User's goal (e.g., "在美团点一杯瑞幸拿铁")
             grid_image_b64: Base64-encoded screenshot with grid overlay
             history: List of previous actions (for context)
-            max_retries: Max retry attempts on API errors
+            max_retries: Retries after the first attempt on transient API
+                errors (rate limits, connection errors, 5xx); other errors
+                are raised immediately. 0 makes a single attempt
+            ui_tree: Optional grid-labelled accessibility tree; when given,
+                it is sent as text instead of the screenshot
 
         Returns:
             Action dict like {"action":"CLICK","grid":"E5","explain":"..."}
 
         Raises:
-            ValueError: If API returns invalid JSON
-            Exception: If API call fails after retries
+            ValueError: If API returns invalid JSON, or max_retries < 0
+            anthropic.APIError: On a non-transient API error
+            RuntimeError: If transient errors persist after all retries,
+                chained to the last error
         """
-        # Build message with context
-        user_message = self._build_user_message(task, history)
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+        request = self._build_request(task, grid_image_b64, history, ui_tree)
+
+        # Call API with retries
+        attempts = max_retries + 1
+        for attempt in range(attempts):
+            try:
+                response = self.client.messages.create(**request)
+                self._track_usage(response.usage)
+
+                # Parse response
+                action = self._parse_response(response)
+                break
+
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                if attempt < attempts - 1:
+                    delay = _retry_delay(attempt, e)
+                    print(
+                        f"⚠️  API error (attempt {attempt + 1}/{attempts}), "
+                        f"retrying in {delay:.1f}s: {e}"
+                    )
+                    time.sleep(delay)
+                else:
+                    raise RuntimeError(
+                        f"API call failed after {attempts} attempts: {e}"
+                    ) from e
+
+        # A click on a cell with no element in the tree means the text view
+        # missed something; ask again with the real screenshot
+        if self._ui_tree_missed(action, history, ui_tree):
+            return self.get_action(task, grid_image_b64, history, max_retries)
 
-        # Prepare content array
-        content = []
+        return action
+
+    async def aget_action(
+        self,
+        task: str,
+        grid_image_b64: str,
+        history: Optional[list] = None,
+        max_retries: int = 2,
+        ui_tree: Optional[str] = None,
+    ) -> dict:
+        """Async version of get_action, for callers running an event loop.
+
+        Builds the same request and tracks usage the same way, but awaits the
+        API call so other coroutines (e.g. device I/O) can run meanwhile.
+
+        Args:
+            task: User's goal (e.g., "在美团点一杯瑞幸拿铁")
+            grid_image_b64: Base64-encoded screenshot with grid overlay
+            history: List of previous actions (for context)
+            max_retries: Retries after the first attempt on transient API
+                errors (rate limits, connection errors, 5xx); other errors
+                are raised immediately. 0 makes a single attempt
+            ui_tree: Optional grid-labelled accessibility tree; when given,
+                it is sent as text instead of the screenshot
+
+        Returns:
+            Action dict like {"action":"CLICK","grid":"E5","explain":"..."}
 
-        # Include previous step's marked screenshot if available
-        if history and len(history) > 0:
+        Raises:
+            ValueError: If API returns invalid JSON, or max_retries < 0
+            anthropic.APIError: On a non-transient API error
+            RuntimeError: If transient errors persist after all retries,
+                chained to the last error
+        """
+        if max_retries < 0:
+            raise ValueError(f"max_retries must be >= 0, got {max_retries}")
+        request = self._build_request(task, grid_image_b64, history, ui_tree)
+
+        # Call API with retries
+        attempts = max_retries + 1
+        for attempt in range(attempts):
+            try:
+                response = await self.aclient.messages.create(**request)
+                self._track_usage(response.usage)
+
+                # Parse response
+                action = self._parse_response(response)
+                break
+
+            except Exception as e:
+                if not _is_retryable(e):
+                    raise
+                if attempt < attempts - 1:
+                    delay = _retry_delay(attempt, e)
+                    print(
+                        f"⚠️  API error (attempt {attempt + 1}/{attempts}), "
+                        f"retrying in {delay:.1f}s: {e}"
+                    )
+                    await asyncio.sleep(delay)
+                else:
+                    raise RuntimeError(
+                        f"API call failed after {attempts} attempts: {e}"
+                    ) from e
+
+        # See get_action
+        if self._ui_tree_missed(action, history, ui_tree):
+            return await self.aget_action(task, grid_image_b64, history, max_retries)
+
+        return action
+
+    async def aget_actions_batch(
+        self, requests: list[dict], concurrency: int = 5
+    ) -> list:
+        """Get actions for several independent tasks concurrently.
+
+        Useful for evaluation sweeps or multi-device runs, where one client
+        can serve every task instead of one sequential call per task.
+
+        Args:
+            requests: aget_action keyword arguments, one dict per task
+            concurrency: Max API calls in flight at once
+
+        Returns:
+            One result per request, in order: the action dict, or the
+            exception that request raised
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(request: dict) -> dict:
+            async with semaphore:
+                return await self.aget_action(**request)
+
+        # Token totals need no lock: _track_usage never awaits, so the
+        # coroutines can't interleave inside it
+        return await asyncio.gather(
+            *(_one(request) for request in requests), return_exceptions=True
+        )
+
+    def _ui_tree_missed(
+        self, action: dict, history: Optional[list], ui_tree: Optional[str]
+    ) -> bool:
+        """Check whether a UI-tree step clicked a cell with no element in the tree."""
+        if not ui_tree or action["action"] != "CLICK":
+            return False
+
+        # Stuck steps are sent the screenshot instead (see _build_request)
+        if self._stuck_warnings(history):
+            return False
+
+        tree_grids = {line.split(":", 1)[0] for line in ui_tree.splitlines()}
+        return action["grid"].strip().upper() not in tree_grids
+
+    @property
+    def aclient(self) -> "AsyncAnthropic":
+        """Async API client, created on first use."""
+        if self._aclient is None:
+            from anthropic import AsyncAnthropic
+
+            self._aclient = AsyncAnthropic(api_key=self.api_key)
+        return self._aclient
+
+    def _build_request(
+        self,
+        task: str,
+        grid_image_b64: str,
+        history: Optional[list] = None,
+        ui_tree: Optional[str] = None,
+    ) -> dict:
+        """Build the messages.create() arguments for one step.
+
+        Args:
+            task: User's goal
+            grid_image_b64: Base64-encoded screenshot with grid overlay
+            history: List of previous actions (for context)
+            ui_tree: Optional grid-labelled accessibility tree (see get_action)
+
+        Returns:
+            Keyword arguments for messages.create()
+        """
+        # Goal and action history come first: they only ever grow by one
+        # block per step, so they form a prefix that prompt caching can reuse
+        content = self._build_history_blocks(task, history)
+        warnings = self._stuck_warnings(history)
+        user_message = self._build_user_message(warnings)
+
+        # The previous step's screenshot doubles the vision tokens, so it's
+        # only sent when the agent looks stuck and needs the before/after view
+        if warnings:
             last_action = history[-1]
-            if "marked_screenshot_b64" in last_action:
+            previous_screenshot = last_action.get("previous_screenshot")
+            if previous_screenshot:
+                marker = previous_screenshot["marker"]
                 content.append(
                     {
                         "type": "image",
                         "source": {
                             "type": "base64",
-                            "media_type": "image/jpeg",
-                            "data": last_action["marked_screenshot_b64"],
+                            "media_type": previous_screenshot["media_type"],
+                            "data": previous_screenshot["image_b64"],
                         },
                     }
                 )
                 content.append(
                     {
                         "type": "text",
-                        "text": "**Previous step screenshot** (showing the action that was just executed):\n\n",
+                        "text": "**Previous step screenshot** (taken right before the action "
+                        f"that was just executed: {marker['type']} {marker['target']}):\n\n",
                     }
                 )
 
-        # Add current screenshot
-        content.append(
-            {
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": "image/jpeg",
-                    "data": grid_image_b64,
-                },
-            }
-        )
+        # Add current screen: a text-only UI tree is far cheaper than an image,
+        # but when the agent looks stuck it gets the real screenshot
+        if ui_tree and not warnings:
+            content.append(
+                {
+                    "type": "text",
+                    "text": "**Current screen (UI tree)** (no screenshot this step; "
+                    "each line is the grid cell at an element's center, its text, "
+                    "and whether it is clickable):\n"
+                    f"{ui_tree}\n\n",
+                }
+            )
+        else:
+            content.append(
+                {
+                    "type": "image",
+                    "source": {
+                        "type": "base64",
+                        "media_type": "image/jpeg",
+                        "data": grid_image_b64,
+                    },
+                }
+            )
 
         # Add user message
         content.append(
@@ -262,81 +640,96 @@ IMPORTANT: Your "explain" and "summary" fields MUST match the language of the us
             }
         ]
 
-        # Call API with retries
-        for attempt in range(max_retries):
-            try:
-                response = self.client.messages.create(
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                    system=self.SYSTEM_PROMPT,
-                    messages=messages,
-                )
+        return {
+            "model": self.model,
+            "max_tokens": self.max_tokens,
+            "temperature": self.temperature,
+            "system": self._build_system(),
+            "messages": messages,
+        }
 
-                # Track usage
-                self.total_input_tokens += response.usage.input_tokens
-                self.total_output_tokens += response.usage.output_tokens
+    def _track_usage(self, usage):
+        """Add one response's token usage to the session totals."""
+        self.total_input_tokens += usage.input_tokens
+        self.total_output_tokens += usage.output_tokens
+        self.total_cache_read_tokens += usage.cache_read_input_tokens or 0
+        self.total_cache_write_tokens += usage.cache_creation_input_tokens or 0
 
-                # Parse response
-                action = self._parse_response(response)
-                return action
+    def _build_system(self):
+        """Build the system parameter, marked as a cache breakpoint if enabled.
 
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"⚠️  API error (attempt {attempt + 1}/{max_retries}): {e}")
-                    time.sleep(1)
-                else:
-                    raise Exception(
-                        f"API call failed after {max_retries} attempts: {e}"
+        The system prompt is identical on every step, so with prompt caching
+        later steps read it from cache instead of paying for it as fresh input.
+        """
+        if not self.prompt_caching:
+            return self.SYSTEM_PROMPT
+
+        return self.SYSTEM_BLOCKS
+
+    def _build_history_blocks(self, task: str, history: Optional[list] = None) -> list:
+        """Build the goal and action history as append-only text blocks.
+
+        Each past action gets its own block with absolute numbering, so the
+        blocks sent on one step are an exact prefix of the next step's. With
+        prompt caching the last block is marked as a cache breakpoint, and
+        the history is read from cache instead of re-billed every step.
+        """
+        if not history:
+            return [{"type": "text", "text": f"**User Goal:** {task}\n\n"}]
+
+        header = f"**User Goal:** {task}\n\n**Previous Actions:**\n"
+        blocks = [{"type": "text", "text": header}]
+        blocks.extend(
+            {"type": "text", "text": self._format_action(i, action)}
+            for i, action in enumerate(history, 1)
+        )
+
+        if self.prompt_caching:
+            blocks[-1]["cache_control"] = {"type": "ephemeral"}
+
+        return blocks
+
+    @staticmethod
+    def _format_action(i: int, action: dict) -> str:
+        """Format one history entry as a numbered line."""
+        formatter = _ACTION_FORMATTERS.get(action.get("action"), _format_generic)
+        return formatter(action, i)
+
+    def _stuck_warnings(self, history: Optional[list] = None) -> list:
+        """Detect signs that the agent is stuck.
+
+        Returns:
+            Warning paragraphs for the prompt (empty on the happy path)
+        """
+        warnings = []
+
+        if history and len(history) >= 2:
+            # Check for repeated clicks on same grid position
+            recent_actions = history[-2:]
+            if all(a.get("action") == "CLICK" for a in recent_actions):
+                recent_grids = [a.get("grid", "") for a in recent_actions]
+                if len(set(recent_grids)) == 1 and recent_grids[0]:
+                    warnings.append(
+                        f"⚠️ **Warning**: Last 2 CLICK actions targeted the same grid position '{recent_grids[0]}'!\n"
+                        "The UI likely changed after the first click. Analyze the current screenshot carefully.\n"
+                        "Do NOT repeat the same click unless you're certain it's needed.\n\n"
                     )
 
-    def _build_user_message(self, task: str, history: Optional[list] = None) -> str:
-        """Build user message with task and history context."""
-        message = f"**User Goal:** {task}\n\n"
-
-        if history and len(history) > 0:
-            message += "**Previous Actions:**\n"
-            for i, action in enumerate(history[-5:], 1):  # Show last 5 actions
-                action_type = action.get("action", "UNKNOWN")
-                explain = action.get("explain", "")
-
-                if action_type == "CLICK":
-                    grid = action.get("grid", "")
-                    message += f"{i}. CLICK {grid} - {explain}\n"
-                elif action_type == "TYPE":
-                    value = action.get("value", "")
-                    message += f'{i}. TYPE "{value}" - {explain}\n'
-                elif action_type == "SCROLL":
-                    value = action.get("value", "")
-                    message += f"{i}. SCROLL {value} - {explain}\n"
-                elif action_type == "AWAKE":
-                    value = action.get("value", "")
-                    message += f"{i}. AWAKE {value} - {explain}\n"
-                else:
-                    message += f"{i}. {action_type} - {explain}\n"
-
-            message += "\n"
-
-            # Add stuck detection warning
-            if len(history) >= 2:
-                # Check for repeated clicks on same grid position
-                recent_actions = history[-2:]
-                if all(a.get("action") == "CLICK" for a in recent_actions):
-                    recent_grids = [a.get("grid", "") for a in recent_actions]
-                    if len(set(recent_grids)) == 1 and recent_grids[0]:
-                        message += f"⚠️ **Warning**: Last 2 CLICK actions targeted the same grid position '{recent_grids[0]}'!\n"
-                        message += "The UI likely changed after the first click. Analyze the current screenshot carefully.\n"
-                        message += "Do NOT repeat the same click unless you're certain it's needed.\n\n"
-                
-                # Check for repeated explains (original logic, but with 2 instead of 3)
-                if len(history) >= 3:
-                    recent_explains = [h.get("explain", "") for h in history[-3:]]
-                    if len(set(recent_explains)) == 1:
-                        message += "⚠️ **Warning**: Last 3 actions had same explanation. You might be stuck!\n"
-                        message += "Consider: Click back button (top-left, grid A1-B3) or try different approach.\n\n"
-
-        message += "**What is the next action?** (Output JSON only)"
-        return message
+            # Check for repeated explains (original logic, but with 2 instead of 3)
+            if len(history) >= 3:
+                recent_explains = [h.get("explain", "") for h in history[-3:]]
+                if len(set(recent_explains)) == 1:
+                    warnings.append(
+                        "⚠️ **Warning**: Last 3 actions had same explanation. You might be stuck!\n"
+                        "Consider: Click back button (top-left, grid A1-B3) or try different approach.\n\n"
+                    )
+
+        return warnings
+
+    def _build_user_message(self, warnings: list) -> str:
+        """Build the per-step prompt: stuck warnings and the question."""
+        parts = [*warnings, "**What is the next action?** (Output JSON only)"]
+        return "".join(parts)
 
     def _parse_response(self, response) -> dict:
         """Parse Claude's response into action dict."""
@@ -352,41 +745,17 @@ IMPORTANT: Your "explain" and "summary" fields MUST match the language of the us
 
         # Remove markdown code blocks if present
         text_content = text_content.strip()
-        if text_content.startswith("```"):
-            # Remove ```json and ``` markers
-            lines = text_content.split("\n")
-            text_content = "\n".join(lines[1:-1])
+        fence = _FENCE_RE.match(text_content)
+        if fence:
+            text_content = fence.group(1)
 
-        # Parse JSON
+        # Parse and validate in one pass
         try:
-            action = json.loads(text_content)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON response: {text_content}\nError: {e}")
-
-        # Validate action structure
-        if "action" not in action:
-            raise ValueError(f"Missing 'action' field in response: {action}")
-
-        action_type = action["action"]
-        if action_type not in ACTION_TYPES:
+            action = _action_adapter().validate_json(text_content)
+        except ValidationError as e:
             raise ValueError(
-                f"Invalid action type '{action_type}'. Must be one of: {ACTION_TYPES}"
-            )
-
-        # Validate required fields based on action type
-        if action_type == "CLICK":
-            if "grid" not in action:
-                raise ValueError(f"CLICK action requires 'grid' field: {action}")
-        elif action_type in ["TYPE", "SCROLL", "AWAKE"]:
-            if "value" not in action:
-                raise ValueError(
-                    f"{action_type} action requires 'value' field: {action}"
-                )
-            # Validate SCROLL direction
-            if action_type == "SCROLL" and action["value"] not in ["up", "down"]:
-                raise ValueError(
-                    f"SCROLL value must be 'up' or 'down', got: {action['value']}"
-                )
+                f"Invalid action response: {text_content}\nError: {e}"
+            ) from e
 
         return action
 
@@ -396,20 +765,25 @@ IMPORTANT: Your "explain" and "summary" fields MUST match the language of the us
         Returns:
             Dict with token counts and costs in USD
         """
-        input_cost = (self.total_input_tokens / 1_000_000) * PRICING[
-            "input_per_million"
-        ]
-        output_cost = (self.total_output_tokens / 1_000_000) * PRICING[
-            "output_per_million"
-        ]
-        total_cost = input_cost + output_cost
+        input_cost = self.total_input_tokens * self._price_input
+        output_cost = self.total_output_tokens * self._price_output
+        cache_read_cost = self.total_cache_read_tokens * self._price_cache_read
+        cache_write_cost = self.total_cache_write_tokens * self._price_cache_write
+        total_cost = input_cost + output_cost + cache_read_cost + cache_write_cost
 
         return {
             "input_tokens": self.total_input_tokens,
             "output_tokens": self.total_output_tokens,
-            "total_tokens": self.total_input_tokens + self.total_output_tokens,
+            "cache_read_tokens": self.total_cache_read_tokens,
+            "cache_write_tokens": self.total_cache_write_tokens,
+            "total_tokens": self.total_input_tokens
+            + self.total_output_tokens
+            + self.total_cache_read_tokens
+            + self.total_cache_write_tokens,
             "input_cost_usd": input_cost,
             "output_cost_usd": output_cost,
+            "cache_read_cost_usd": cache_read_cost,
+            "cache_write_cost_usd": cache_write_cost,
             "total_cost_usd": total_cost,
         }
 
@@ -421,10 +795,16 @@ IMPORTANT: Your "explain" and "summary" fields MUST match the language of the us
         print("=" * 50)
         print(f"Input tokens:  {cost['input_tokens']:,}")
         print(f"Output tokens: {cost['output_tokens']:,}")
+        if cost["cache_read_tokens"] or cost["cache_write_tokens"]:
+            print(f"Cache reads:   {cost['cache_read_tokens']:,}")
+            print(f"Cache writes:  {cost['cache_write_tokens']:,}")
         print(f"Total tokens:  {cost['total_tokens']:,}")
         print("-" * 50)
         print(f"Input cost:    ${cost['input_cost_usd']:.4f}")
         print(f"Output cost:   ${cost['output_cost_usd']:.4f}")
+        if cost["cache_read_tokens"] or cost["cache_write_tokens"]:
+            cache_cost = cost["cache_read_cost_usd"] + cost["cache_write_cost_usd"]
+            print(f"Cache cost:    ${cache_cost:.4f}")
         print(f"Total cost:    ${cost['total_cost_usd']:.4f}")
         print("=" * 50 + "\n")
 
@@ -3,11 +3,8 @@
 Backward compatibility wrapper around new settings system.
 """
 
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
 
 # Lazy initialization to avoid ADB detection during import
 _settings = None
@@ -17,7 +14,11 @@ def _get_settings():
     """Lazy load settings to avoid ADB auto-detection during import."""
     global _settings
     if _settings is None:
+        from dotenv import load_dotenv
         from lightguiagent.settings import get_settings
+
+        # Load environment variables from .env file
+        load_dotenv()
         _settings = get_settings()
     return _settings
 
@@ -35,19 +36,31 @@ LOGS_DIR.mkdir(parents=True, exist_ok=True)
 # Claude API Configuration (lazy-loaded)
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def _get_claude_config():
     """Lazy load Claude config."""
     settings = _get_settings()
+
+    # Validate API key
+    if not settings.api_key:
+        print("⚠️  Warning: ANTHROPIC_API_KEY not set. Please set it via:")
+        print("   export ANTHROPIC_API_KEY='your-key-here'")
+
     return {
         "api_key": settings.api_key,
         "model": settings.claude.model,
         "max_tokens": settings.claude.max_tokens,
         "temperature": settings.claude.temperature,
+        "prompt_caching": settings.claude.prompt_caching,
     }
 
 # Create property-like access
 class _ConfigProxy:
-    """Proxy for lazy config loading."""
+    """Proxy for lazy config loading.
+
+    Each config dict is built once on first access and cached; call
+    invalidate() after changing settings to rebuild it.
+    """
     def __getitem__(self, key):
         return _get_claude_config()[key]
     
@@ -57,17 +70,21 @@ class _ConfigProxy:
     def get(self, key, default=None):
         return _get_claude_config().get(key, default)
 
-CLAUDE_CONFIG = _ConfigProxy()
+    def keys(self):
+        return _get_claude_config().keys()
 
-# Validate API key
-if not CLAUDE_CONFIG["api_key"]:
-    print("⚠️  Warning: ANTHROPIC_API_KEY not set. Please set it via:")
-    print("   export ANTHROPIC_API_KEY='your-key-here'")
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached config so the next access re-reads settings."""
+        _get_claude_config.cache_clear()
+
+CLAUDE_CONFIG = _ConfigProxy()
 
 # ============================================================================
 # Grid System Configuration (lazy-loaded)
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def _get_grid_config():
     """Lazy load grid config."""
     settings = _get_settings()
@@ -88,6 +105,8 @@ def _get_grid_config():
         "inner_label_opacity": settings.grid_style.inner_label_opacity,
         "target_size": 1568,  # Claude optimal image size
         "compression_quality": 85,  # JPEG quality
+        "resize_filter": "bilinear",  # Downscale filter: "bilinear" or "lanczos"
+        "resize_mode": "fit_long_edge",  # "fit_long_edge" to target_size, or "none"
     }
 
 class _GridConfigProxy(_ConfigProxy):
@@ -101,20 +120,34 @@ class _GridConfigProxy(_ConfigProxy):
     def get(self, key, default=None):
         return _get_grid_config().get(key, default)
 
+    def keys(self):
+        return _get_grid_config().keys()
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached config so the next access re-reads settings."""
+        _get_grid_config.cache_clear()
+
 GRID_CONFIG = _GridConfigProxy()
 
 # ============================================================================
 # Agent Behavior Configuration (lazy-loaded)
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def _get_agent_config():
     """Lazy load agent config."""
     settings = _get_settings()
     return {
         "max_steps": settings.agent.max_steps,
         "delay_after_action": settings.agent.delay_after_action,
+        "adaptive_delay": settings.agent.adaptive_delay,
         "save_debug_images": settings.agent.save_screenshots,
         "verbose": settings.agent.verbose,
+        "history_image_window": settings.agent.history_image_window,
+        "screenshot_long_edge": settings.agent.screenshot_long_edge,
+        "ui_tree": settings.agent.ui_tree,
+        "ui_tree_max_chars": settings.agent.ui_tree_max_chars,
     }
 
 class _AgentConfigProxy(_ConfigProxy):
@@ -128,6 +161,14 @@ class _AgentConfigProxy(_ConfigProxy):
     def get(self, key, default=None):
         return _get_agent_config().get(key, default)
 
+    def keys(self):
+        return _get_agent_config().keys()
+
+    @classmethod
+    def invalidate(cls):
+        """Drop the cached config so the next access re-reads settings."""
+        _get_agent_config.cache_clear()
+
 AGENT_CONFIG = _AgentConfigProxy()
 
 # ============================================================================
@@ -136,24 +177,12 @@ AGENT_CONFIG = _AgentConfigProxy()
 
 ADB_CONFIG = {
     "device_serial": None,  # None = use first connected device
-    "screenshot_path": "/sdcard/screenshot.png",  # Temp path on device
+    "raw_screencap": True,  # Capture raw framebuffer (no on-device PNG encode)
     "local_screenshot_dir": DEBUG_DIR / "screenshots",
 }
 
 ADB_CONFIG["local_screenshot_dir"].mkdir(exist_ok=True)
 
-# ============================================================================
-# Action Definitions
-# ============================================================================
-
-ACTION_TYPES = [
-    "CLICK",  # Click on grid cell
-    "TYPE",  # Type text
-    "SCROLL",  # Scroll screen (up/down)
-    "AWAKE",  # Launch app by package name
-    "COMPLETE",  # Task completed
-]
-
 # ============================================================================
 # Cost Tracking
 # ============================================================================
@@ -161,4 +190,6 @@ ACTION_TYPES = [
 PRICING = {
     "input_per_million": 5.00,  # $5 per million input tokens
     "output_per_million": 25.00,  # $25 per million output tokens
+    "cache_read_per_million": 0.50,  # $0.50 per million cached input tokens read
+    "cache_write_per_million": 6.25,  # $6.25 per million input tokens written to cache
 }
@@ -4,6 +4,8 @@ Converts between grid notation (e.g., "E5") and pixel coordinates.
 Grid system: A-J (columns) × 1-20 (rows)
 """
 
+from functools import lru_cache
+
 from lightguiagent.config import GRID_CONFIG
 
 
@@ -24,6 +26,22 @@ class GridConverter:
 
         # Column letters (A-J for 10 cols)
         self.col_letters = [chr(65 + i) for i in range(self.cols)]  # A=65 in ASCII
+        self._max_col_ord = 64 + self.cols  # ord() of the last column letter
+
+        # The grid only has cols × rows cells, so precompute every cell center
+        # once; lookups then skip parsing and validation entirely
+        col_centers = [int((i + 0.5) * self.cell_width) for i in range(self.cols)]
+        row_centers = [int((i + 0.5) * self.cell_height) for i in range(self.rows)]
+        self._centers = {
+            f"{col_letter}{row}": (x, row_centers[row - 1])
+            for col_letter, x in zip(self.col_letters, col_centers)
+            for row in range(1, self.rows + 1)
+        }
+        # And every label by [col_index][row_index], for pixel lookups
+        self._labels = [
+            [f"{col_letter}{row}" for row in range(1, self.rows + 1)]
+            for col_letter in self.col_letters
+        ]
 
     def grid_to_pixel(self, grid_str: str) -> tuple[int, int]:
         """Convert grid notation to pixel coordinates (center of cell).
@@ -41,7 +59,26 @@ class GridConverter:
             >>> converter.grid_to_pixel("E5")
             (486, 540)  # Center of cell E5
         """
-        return self._single_grid_to_pixel(grid_str.strip().upper())
+        try:
+            return self._centers[grid_str]
+        except KeyError:
+            # Lowercase/padded labels, or invalid ones (raises ValueError)
+            return self._single_grid_to_pixel(grid_str.strip().upper())
+
+    def grids_to_pixels(self, grid_strs) -> list[tuple[int, int]]:
+        """Convert many grid labels at once (e.g. when replaying a task log).
+
+        Args:
+            grid_strs: Iterable of grid notations like "E5"
+
+        Returns:
+            List of (x, y) pixel coordinates, in the same order
+        """
+        centers = self._centers
+        return [
+            centers[grid_str] if grid_str in centers else self.grid_to_pixel(grid_str)
+            for grid_str in grid_strs
+        ]
 
     def _single_grid_to_pixel(self, grid_str: str) -> tuple[int, int]:
         """Convert single grid notation to pixel coordinates (center of cell).
@@ -63,8 +100,9 @@ class GridConverter:
         col_letter = grid_str[0]
         row_str = grid_str[1:]
 
-        # Validate column
-        if col_letter not in self.col_letters:
+        # Validate column (letters are contiguous, so a range check suffices)
+        col_ord = ord(col_letter)
+        if not (65 <= col_ord <= self._max_col_ord):
             raise ValueError(
                 f"Invalid column '{col_letter}'. Must be A-{self.col_letters[-1]}"
             )
@@ -79,7 +117,7 @@ class GridConverter:
             raise ValueError(f"Invalid row {row}. Must be 1-{self.rows}")
 
         # Calculate pixel position (center of cell)
-        col_index = self.col_letters.index(col_letter)
+        col_index = col_ord - 65
         x = int((col_index + 0.5) * self.cell_width)
         y = int((row - 0.5) * self.cell_height)  # Row is 1-indexed
 
@@ -108,11 +146,28 @@ class GridConverter:
         col_index = max(0, min(col_index, self.cols - 1))
         row_index = max(0, min(row_index, self.rows - 1))
 
-        # Convert to grid notation
-        col_letter = self.col_letters[col_index]
-        row = row_index + 1  # Convert to 1-indexed
+        return self._labels[col_index][row_index]
 
-        return f"{col_letter}{row}"
+    def pixels_to_grids(self, points) -> list[str]:
+        """Convert many pixel coordinates at once (e.g. candidate tap points).
+
+        Args:
+            points: Iterable of (x, y) pixel coordinates
+
+        Returns:
+            List of grid notations like "E5", in the same order
+        """
+        labels = self._labels
+        cell_width = self.cell_width
+        cell_height = self.cell_height
+        last_col = self.cols - 1
+        last_row = self.rows - 1
+        return [
+            labels[max(0, min(int(x / cell_width), last_col))][
+                max(0, min(int(y / cell_height), last_row))
+            ]
+            for x, y in points
+        ]
 
     def get_cell_bounds(self, grid_str: str) -> tuple[int, int, int, int]:
         """Get the bounding box of a grid cell.
@@ -129,10 +184,13 @@ class GridConverter:
             (432, 480, 540, 600)
         """
         grid_str = grid_str.strip().upper()
-        col_letter = grid_str[0]
+        col_index = ord(grid_str[0]) - 65
         row = int(grid_str[1:])
 
-        col_index = self.col_letters.index(col_letter)
+        if not (0 <= col_index < self.cols):
+            raise ValueError(
+                f"Invalid column '{grid_str[0]}'. Must be A-{self.col_letters[-1]}"
+            )
 
         left = int(col_index * self.cell_width)
         top = int((row - 1) * self.cell_height)
@@ -143,17 +201,25 @@ class GridConverter:
 
 
 # Convenience functions using default config
-_default_converter = GridConverter()
+@lru_cache(maxsize=1)
+def _default_converter() -> GridConverter:
+    """Default converter, built on first use (reading GRID_CONFIG loads settings)."""
+    return GridConverter()
 
 
+@lru_cache(maxsize=256)
 def grid_to_pixel(grid_str: str) -> tuple[int, int]:
-    """Convert grid notation to pixel coordinates (convenience function)."""
-    return _default_converter.grid_to_pixel(grid_str)
+    """Convert grid notation to pixel coordinates (convenience function).
+
+    Memoized: inputs are a small set of labels, including lowercase or
+    padded spellings that miss the converter's center table.
+    """
+    return _default_converter().grid_to_pixel(grid_str)
 
 
 def pixel_to_grid(x: int, y: int) -> str:
     """Convert pixel coordinates to grid notation (convenience function)."""
-    return _default_converter.pixel_to_grid(x, y)
+    return _default_converter().pixel_to_grid(x, y)
 
 
 if __name__ == "__main__":
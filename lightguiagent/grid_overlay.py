@@ -5,15 +5,89 @@ Adds grid lines and labels to screenshots to help Claude understand coordinates.
 
 import base64
 import io
+from functools import lru_cache
 from pathlib import Path
 from PIL import Image, ImageDraw, ImageFont
 
 from lightguiagent.config import GRID_CONFIG
+from lightguiagent.grid_converter import GridConverter
+
+# Downscale filters selectable via the "resize_filter" grid config key
+RESIZE_FILTERS = {
+    "bilinear": Image.Resampling.BILINEAR,
+    "lanczos": Image.Resampling.LANCZOS,
+}
+
+
+def scale_grid_config(config, scale: float) -> dict:
+    """Scale a grid config to a resized screenshot canvas.
+
+    The grid keeps the same columns and rows, so grid labels refer to the same
+    cells on the device regardless of the canvas resolution.
+
+    Args:
+        config: Grid config for the device screen
+        scale: Canvas size relative to the device screen
+
+    Returns:
+        Grid config dict for the scaled canvas
+    """
+    scaled = dict(config)
+    scaled["screen_width"] = round(config["screen_width"] * scale)
+    scaled["screen_height"] = round(config["screen_height"] * scale)
+    scaled["cell_width"] = scaled["screen_width"] / config["grid_cols"]
+    scaled["cell_height"] = scaled["screen_height"] / config["grid_rows"]
+    scaled["line_width"] = max(1, round(config["line_width"] * scale))
+    scaled["label_size"] = max(8, round(config["label_size"] * scale))
+    return scaled
+
+
+@lru_cache(maxsize=8)
+def _load_font(size: int):
+    """Load the label font at a size, shared by every overlay."""
+    try:
+        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size)
+    except Exception:
+        # Fallback to default font
+        return ImageFont.load_default()
+
+
+@lru_cache(maxsize=1024)
+def _render_label_tile(
+    text: str, font_size: int, padding: int, bg_color: tuple, text_color: tuple
+) -> Image.Image:
+    """Render a label (background + text) as an RGBA tile.
+
+    Tiles are shared across overlays, so an overlay rebuilt for a new canvas
+    with the same label style reuses them. Callers must not draw on a tile.
+    """
+    font = _load_font(font_size)
+
+    # Get text size
+    bbox = font.getbbox(text)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+
+    # Background fills the whole tile; text is composited over it
+    size = (
+        text_width // 2 * 2 + 2 * padding + 1,
+        text_height // 2 * 2 + 2 * padding + 1,
+    )
+    tile = Image.new("RGBA", size, bg_color)
+    text_layer = Image.new("RGBA", size, text_color + (0,))
+    ImageDraw.Draw(text_layer).text(
+        (padding, padding), text, fill=text_color + (255,), font=font
+    )
+    return Image.alpha_composite(tile, text_layer)
 
 
 class GridOverlay:
     """Adds grid overlay to screenshots."""
 
+    LABEL_PADDING = 4  # Label background margin around the text, in pixels
+    MARKER_RADIUS = 40  # CLICK marker circle radius, in pixels
+    MARKER_LINE_LEN = 60  # CLICK marker crosshair half-length, in pixels
+
     def __init__(self, config=None):
         """Initialize with grid configuration.
 
@@ -36,16 +110,24 @@ class GridOverlay:
         # Column letters
         self.col_letters = [chr(65 + i) for i in range(self.cols)]
 
-        # Try to load font
-        try:
-            self.font = ImageFont.truetype(
-                "/System/Library/Fonts/Helvetica.ttc", self.label_size
-            )
-        except Exception:
-            # Fallback to default font
-            self.font = ImageFont.load_default()
+        # Grid geometry for this canvas (used to place action markers)
+        self.converter = GridConverter(config=self.config)
+        self._line_boxes = self._grid_line_boxes()
+        self._line_fill = tuple(self.line_color)
+
+        # Load font (shared with other overlays of the same label size)
+        self.font = _load_font(self.label_size)
+
+        # Line height for action labels, from glyphs with an ascender and a
+        # descender, so per-call sizing only needs the advance width
+        ascent_bbox = self.font.getbbox("Ag")
+        self._text_height = ascent_bbox[3] - ascent_bbox[1]
+
+        # Where each label tile goes on the canvas (see _label_layout)
+        self._layout = None
+        self._marker = None  # CLICK marker tile (see _click_marker)
 
-    def apply(self, image_input) -> Image.Image:
+    def apply(self, image_input, in_place: bool = False) -> Image.Image:
         """Apply grid overlay to an image.
 
         Args:
@@ -53,44 +135,46 @@ class GridOverlay:
                 - PIL Image object
                 - Path to image file (str or Path)
                 - File-like object
+            in_place: Draw on an RGB image_input itself instead of a copy (for
+                callers that no longer need the plain image)
 
         Returns:
             PIL Image with grid overlay applied
         """
         # Load image if needed
-        if isinstance(image_input, (str, Path)):
-            image = Image.open(image_input)
-        elif isinstance(image_input, Image.Image):
-            image = image_input.copy()
+        if isinstance(image_input, Image.Image):
+            image = image_input
         else:
             image = Image.open(image_input)
 
-        # Convert to RGB if needed
+        # Convert to RGB if needed; the conversion already makes a new image,
+        # so a copy is only needed for RGB input the caller still owns
         if image.mode != "RGB":
             image = image.convert("RGB")
+        elif image is image_input and not in_place:
+            image = image.copy()
 
-        # Create drawing context
-        draw = ImageDraw.Draw(image, "RGBA")
+        # Draw grid lines as solid stripes: a color paste is a plain C fill,
+        # with none of the polygon rasterizing draw.line does for wide lines
+        line_fill = self._line_fill
+        for box in self._line_boxes:
+            image.paste(line_fill, box)
 
-        # Draw vertical grid lines (columns)
-        for i in range(self.cols + 1):
-            x = int(i * self.cell_width)
-            draw.line(
-                [(x, 0), (x, self.config["screen_height"])],
-                fill=self.line_color,
-                width=self.line_width,
-            )
+        # The label layout is the same on every screenshot, so tiles and
+        # their positions are worked out once and only pasted here
+        for tile, position in self._label_layout():
+            image.paste(tile, position, tile)
 
-        # Draw horizontal grid lines (rows)
-        for i in range(self.rows + 1):
-            y = int(i * self.cell_height)
-            draw.line(
-                [(0, y), (self.config["screen_width"], y)],
-                fill=self.line_color,
-                width=self.line_width,
-            )
+        return image
+
+    def _label_layout(self) -> list[tuple[Image.Image, tuple[int, int]]]:
+        """List every label tile with its top-left position, built on first use."""
+        if self._layout is not None:
+            return self._layout
 
-        # Draw column labels (A, B, C, ...)
+        layout = []
+
+        # Column labels (A, B, C, ...)
         label_y_top = 10
         label_y_bottom = int(self.config["screen_height"] - self.label_size - 10)
 
@@ -98,11 +182,11 @@ class GridOverlay:
             x = int((i + 0.5) * self.cell_width)
 
             # Top labels
-            self._draw_label(draw, letter, x, label_y_top)
+            self._place_label(layout, letter, x, label_y_top)
             # Bottom labels for easier reading
-            self._draw_label(draw, letter, x, label_y_bottom)
+            self._place_label(layout, letter, x, label_y_bottom)
 
-        # Draw row labels (1, 2, 3, ...)
+        # Row labels (1, 2, 3, ...)
         label_x_left = 10
         label_x_right = int(self.config["screen_width"] - self.label_size - 10)
 
@@ -111,58 +195,73 @@ class GridOverlay:
             y = int((i + 0.5) * self.cell_height)
 
             # Left labels
-            self._draw_label(draw, row_num, label_x_left, y)
+            self._place_label(layout, row_num, label_x_left, y)
             # Right labels for easier reading
-            self._draw_label(draw, row_num, label_x_right, y)
+            self._place_label(layout, row_num, label_x_right, y)
 
-        # Draw inner coordinate labels (optional)
+        # Inner coordinate labels (optional)
         if self.config.get("show_inner_labels", True):
-            self._draw_inner_labels(draw)
+            self._place_inner_labels(layout)
 
-        return image
+        self._layout = layout
+        return layout
+
+    def _grid_line_boxes(self) -> list[tuple[int, int, int, int]]:
+        """Compute the (left, top, right, bottom) stripe of every grid line.
+
+        Lines are line_width thick and centered on the cell edges; stripes
+        are clipped to the canvas.
+        """
+        width = self.config["screen_width"]
+        height = self.config["screen_height"]
+        half = self.line_width // 2
+
+        boxes = []
+        for i in range(self.cols + 1):
+            left = max(0, int(i * self.cell_width) - half)
+            boxes.append((left, 0, min(width, left + self.line_width), height))
+        for i in range(self.rows + 1):
+            top = max(0, int(i * self.cell_height) - half)
+            boxes.append((0, top, width, min(height, top + self.line_width)))
+        return boxes
 
-    def _draw_label(self, draw, text, x, y, opacity=None):
-        """Draw a label with background for better visibility.
+    def _place_label(self, layout, text, x, y, opacity=None):
+        """Add a label with background for better visibility to a layout.
 
         Args:
-            draw: ImageDraw object
+            layout: List of (tile, position) pairs to append to
             text: Label text
             x, y: Center position of the label
             opacity: Optional opacity override for label (0-255)
         """
-        # Get text size
-        bbox = draw.textbbox((0, 0), text, font=self.font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-
-        # Calculate background rectangle
-        padding = 4
-        bg_left = x - text_width // 2 - padding
-        bg_top = y - text_height // 2 - padding
-        bg_right = x + text_width // 2 + padding
-        bg_bottom = y + text_height // 2 + padding
-
-        # Apply custom opacity if provided
+        tile = self._label_tile(text, opacity)
+        left = x - (tile.width - 1) // 2
+        top = y - (tile.height - 1) // 2
+        layout.append((tile, (left, top)))
+
+    def _label_tile(self, text, opacity=None) -> Image.Image:
+        """Get the cached RGBA tile for a label (background + text).
+
+        The same few dozen labels are drawn on every screenshot, so text is
+        rasterized once per label style instead of once per frame.
+        """
+        # Apply custom opacity if provided (to the background only: text was
+        # always blended in by its glyph coverage alone, so it stays solid)
         if opacity is not None:
-            bg_color = self.label_bg_color[:3] + (opacity,)
-            text_color = self.label_color + (opacity,)
+            bg_color = tuple(self.label_bg_color[:3]) + (opacity,)
         else:
-            bg_color = self.label_bg_color
-            text_color = self.label_color
+            bg_color = tuple(self.label_bg_color)
+        text_color = tuple(self.label_color[:3])
 
-        # Draw background
-        draw.rectangle([bg_left, bg_top, bg_right, bg_bottom], fill=bg_color)
-
-        # Draw text
-        text_x = x - text_width // 2
-        text_y = y - text_height // 2
-        draw.text((text_x, text_y), text, fill=text_color, font=self.font)
+        return _render_label_tile(
+            text, self.label_size, self.LABEL_PADDING, bg_color, text_color
+        )
 
-    def _draw_inner_labels(self, draw):
-        """Draw coordinate labels inside grid cells for easier identification.
+    def _place_inner_labels(self, layout):
+        """Add coordinate labels inside grid cells for easier identification.
         
         Args:
-            draw: ImageDraw object
+            layout: List of (tile, position) pairs to append to
         """
         interval = self.config.get("inner_label_interval", 3)
         opacity = self.config.get("inner_label_opacity", 128)
@@ -179,81 +278,209 @@ class GridOverlay:
                 row_num = str(row_idx + 1)
                 label_text = f"{col_letter}{row_num}"
                 
-                # Draw semi-transparent label
-                self._draw_label(draw, label_text, x, y, opacity=opacity)
+                # Place semi-transparent label
+                self._place_label(layout, label_text, x, y, opacity=opacity)
 
-    def compress_and_encode(
+    def resize(self, image: Image.Image, size: tuple[int, int]) -> Image.Image:
+        """Downscale an image with the configured filter.
+
+        Large ratios are first box-reduced by an integer factor (a cheap
+        block average), so the final filter only covers the remaining < 2x.
+
+        Args:
+            image: PIL Image
+            size: Target (width, height)
+
+        Returns:
+            Resized image
+        """
+        resample = RESIZE_FILTERS[self.config.get("resize_filter", "bilinear")]
+        return image.resize(size, resample, reducing_gap=1.0)
+
+    def compress(
         self, image: Image.Image, target_size=None, quality=None
-    ) -> str:
-        """Compress image and encode to base64.
+    ) -> memoryview:
+        """Compress image for the Claude API.
 
         Args:
             image: PIL Image
-            target_size: Target size (will be square), defaults to config
+            target_size: Max long edge in pixels (aspect ratio is kept), defaults to
+                config; ignored when the "resize_mode" config is "none"
             quality: JPEG quality 1-100, defaults to config
 
         Returns:
-            Base64 encoded string suitable for Claude API
+            Encoded image bytes (a view of the encoder's buffer, not a copy)
         """
         target_size = target_size or self.config["target_size"]
         quality = quality or self.config["compression_quality"]
 
-        # Resize to target size (square)
-        image_resized = image.resize(
-            (target_size, target_size), Image.Resampling.LANCZOS
-        )
+        # Fit the long edge to target size, never upscaling a smaller canvas.
+        # Keeping the aspect ratio avoids paying for stretched pixels and
+        # keeps grid cells their real shape. With resize_mode "none" the
+        # image is sent as-is and payload size is left to quality alone
+        fit = self.config.get("resize_mode", "fit_long_edge") == "fit_long_edge"
+        if fit and max(image.size) > target_size:
+            scale = target_size / max(image.size)
+            resized_size = (
+                max(1, round(image.width * scale)),
+                max(1, round(image.height * scale)),
+            )
+            image_resized = self.resize(image, resized_size)
+        else:
+            image_resized = image
 
-        # Convert to JPEG and encode
+        # Convert to JPEG and encode. Baseline 4:2:0 JPEG without
+        # Huffman optimization stays on libjpeg-turbo's fast path; optimize
+        # only trims a few percent off the payload at over twice the cost,
+        # and image tokens depend on pixel size, not bytes
         buffer = io.BytesIO()
-        image_resized.save(buffer, format="JPEG", quality=quality)
-        buffer.seek(0)
+        image_resized.save(
+            buffer,
+            format="JPEG",
+            quality=quality,
+            optimize=False,
+            progressive=False,
+            subsampling=2,
+        )
 
-        # Encode to base64
-        image_bytes = buffer.read()
-        b64_string = base64.b64encode(image_bytes).decode("utf-8")
+        return buffer.getbuffer()
+
+    def compress_and_encode(
+        self,
+        image: Image.Image,
+        target_size=None,
+        quality=None,
+        return_bytes: bool = False,
+    ):
+        """Compress image and encode to base64.
+
+        Args:
+            image: PIL Image
+            target_size: Max long edge in pixels (aspect ratio is kept), defaults to config
+            quality: JPEG quality 1-100, defaults to config
+            return_bytes: Also return the encoded image bytes the string was
+                made from
 
+        Returns:
+            Base64 encoded string suitable for Claude API, or
+            (image_bytes, base64_string) with return_bytes
+        """
+        image_bytes = self.compress(image, target_size, quality)
+        b64_string = base64.b64encode(image_bytes).decode("ascii")
+        if return_bytes:
+            return image_bytes, b64_string
         return b64_string
 
-    def process_screenshot(
-        self, screenshot_path, save_path=None
-    ) -> tuple[Image.Image, str]:
+    def process_screenshot(self, screenshot_path, save_path=None, return_bytes=False):
         """Complete pipeline: load screenshot, add grid, compress, encode.
 
         Args:
-            screenshot_path: Path to original screenshot
-            save_path: Optional path to save annotated image
+            screenshot_path: Path to original screenshot, or the screenshot
+                itself as a PIL Image (left unmodified)
+            save_path: Optional path to save annotated image. A .jpg/.jpeg
+                path gets the same JPEG that was encoded for Claude; any
+                other path gets the full-resolution image in that format
+            return_bytes: Also return the JPEG bytes the string was made from,
+                for callers that need both without encoding again
 
         Returns:
-            (annotated_image, base64_string)
+            (annotated_image, base64_string), or
+            (annotated_image, jpeg_bytes, base64_string) with return_bytes
         """
         # Apply grid overlay
         annotated_image = self.apply(screenshot_path)
 
-        # Save if requested
-        if save_path:
-            Path(save_path).parent.mkdir(parents=True, exist_ok=True)
-            annotated_image.save(save_path)
-
         # Compress and encode
-        b64_string = self.compress_and_encode(annotated_image)
+        jpeg_bytes, b64_string = self.compress_and_encode(
+            annotated_image, return_bytes=True
+        )
 
+        # Save if requested, reusing the JPEG rather than encoding again.
+        # PNG is a debug artifact, so trade file size for a faster encode
+        if save_path:
+            save_path = Path(save_path)
+            save_path.parent.mkdir(parents=True, exist_ok=True)
+            if save_path.suffix.lower() in (".jpg", ".jpeg"):
+                save_path.write_bytes(jpeg_bytes)
+            else:
+                annotated_image.save(save_path, compress_level=1)
+
+        if return_bytes:
+            return annotated_image, jpeg_bytes, b64_string
         return annotated_image, b64_string
 
-    def mark_action(self, image: Image.Image, action: dict) -> Image.Image:
+    def _text_size(self, text: str) -> tuple[int, int]:
+        """Measure an action label from its advance width and the line height."""
+        return int(self.font.getlength(text)), self._text_height
+
+    def _click_marker(self) -> Image.Image:
+        """Render the CLICK marker (circle + crosshair) once as an RGBA tile."""
+        if self._marker is not None:
+            return self._marker
+
+        radius = self.MARKER_RADIUS
+        line_len = self.MARKER_LINE_LEN
+        c = line_len  # Tile center
+        red = (255, 0, 0, 255)
+
+        marker = Image.new("RGBA", (2 * c + 1, 2 * c + 1), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(marker)
+        draw.ellipse(
+            [(c - radius, c - radius), (c + radius, c + radius)], outline=red, width=6
+        )
+        # Crosshair bars as plain fills (4px thick, like a width=4 line)
+        draw.rectangle([c - line_len, c - 1, c + line_len, c + 2], fill=red)
+        draw.rectangle([c - 1, c - line_len, c + 2, c + line_len], fill=red)
+
+        self._marker = marker
+        return marker
+
+    def _paste_action_label(
+        self, image: Image.Image, label: str, x: int, y: int, pad_x: int, fill
+    ):
+        """Paste an action label (translucent background + white text).
+
+        The label is drawn on a small RGBA tile and pasted through its own
+        alpha, so only the label area is blended instead of drawing on the
+        whole frame in RGBA mode.
+
+        Args:
+            image: RGB image to paste onto
+            label: Label text
+            x, y: Top-left of the text
+            pad_x: Horizontal background margin (vertical margin is 5)
+            fill: RGBA background color
+        """
+        label_width, label_height = self._text_size(label)
+        pad_y = 5
+        tile = Image.new(
+            "RGBA",
+            (label_width + 2 * pad_x + 1, label_height + 2 * pad_y + 1),
+            fill,
+        )
+        text_layer = Image.new("RGBA", tile.size, (255, 255, 255, 0))
+        ImageDraw.Draw(text_layer).text(
+            (pad_x, pad_y), label, fill=(255, 255, 255, 255), font=self.font
+        )
+        tile = Image.alpha_composite(tile, text_layer)
+        image.paste(tile, (x - pad_x, y - pad_y), tile)
+
+    def mark_action(
+        self, image: Image.Image, action: dict, in_place: bool = False
+    ) -> Image.Image:
         """Mark the action location on the image with a visual indicator.
 
         Args:
             image: PIL Image with grid overlay
             action: Action dict with 'action' and 'grid' or 'value' fields
+            in_place: Draw on image itself instead of a copy (for callers
+                that no longer need the unmarked image)
 
         Returns:
             Image with action marker
         """
-        from lightguiagent.grid_converter import grid_to_pixel
-
-        # Create a copy to avoid modifying original
-        marked_image = image.copy()
-        draw = ImageDraw.Draw(marked_image, "RGBA")
+        # Copy unless the caller gave up the original
+        marked_image = image if in_place else image.copy()
 
         action_type = action.get("action")
 
@@ -264,44 +491,23 @@ class GridOverlay:
                 return marked_image
 
             try:
-                x, y = grid_to_pixel(grid)
-
-                # Draw a red circle at click position
-                radius = 40
-                draw.ellipse(
-                    [(x - radius, y - radius), (x + radius, y + radius)],
-                    outline=(255, 0, 0),
-                    width=6,
-                )
+                x, y = self.converter.grid_to_pixel(grid)
 
-                # Draw crosshair
-                line_len = 60
-                draw.line(
-                    [(x - line_len, y), (x + line_len, y)], fill=(255, 0, 0), width=4
-                )
-                draw.line(
-                    [(x, y - line_len), (x, y + line_len)], fill=(255, 0, 0), width=4
-                )
+                # Red circle + crosshair at click position, pre-rendered once
+                radius = self.MARKER_RADIUS
+                marker = self._click_marker()
+                half = marker.width // 2
+                marked_image.paste(marker, (x - half, y - half), marker)
 
                 # Add label
                 label = f"CLICK {grid}"
-                bbox = draw.textbbox((0, 0), label, font=self.font)
-                label_width = bbox[2] - bbox[0]
-                label_height = bbox[3] - bbox[1]
+                label_width, label_height = self._text_size(label)
 
                 label_x = x - label_width // 2
                 label_y = y - radius - label_height - 10
 
-                # Draw background for label
-                draw.rectangle(
-                    [
-                        (label_x - 5, label_y - 5),
-                        (label_x + label_width + 5, label_y + label_height + 5),
-                    ],
-                    fill=(255, 0, 0, 200),
-                )
-                draw.text(
-                    (label_x, label_y), label, fill=(255, 255, 255), font=self.font
+                self._paste_action_label(
+                    marked_image, label, label_x, label_y, 5, (255, 0, 0, 200)
                 )
 
             except Exception as e:
@@ -312,24 +518,14 @@ class GridOverlay:
             text = action.get("value", "")
             if text:
                 label = f'TYPE: "{text}"'
-                bbox = draw.textbbox((0, 0), label, font=self.font)
-                label_width = bbox[2] - bbox[0]
-                label_height = bbox[3] - bbox[1]
+                label_width, label_height = self._text_size(label)
 
                 # Position at top center (use actual image width)
                 label_x = (marked_image.width - label_width) // 2
                 label_y = 20
 
-                # Draw background
-                draw.rectangle(
-                    [
-                        (label_x - 10, label_y - 5),
-                        (label_x + label_width + 10, label_y + label_height + 5),
-                    ],
-                    fill=(0, 128, 255, 200),
-                )
-                draw.text(
-                    (label_x, label_y), label, fill=(255, 255, 255), font=self.font
+                self._paste_action_label(
+                    marked_image, label, label_x, label_y, 10, (0, 128, 255, 200)
                 )
 
         elif action_type == "AWAKE":
@@ -337,40 +533,34 @@ class GridOverlay:
             package = action.get("value", "")
             if package:
                 label = f"AWAKE: {package}"
-                bbox = draw.textbbox((0, 0), label, font=self.font)
-                label_width = bbox[2] - bbox[0]
-                label_height = bbox[3] - bbox[1]
+                label_width, label_height = self._text_size(label)
 
                 # Position at top center (use actual image width)
                 label_x = (marked_image.width - label_width) // 2
                 label_y = 20
 
-                draw.rectangle(
-                    [
-                        (label_x - 10, label_y - 5),
-                        (label_x + label_width + 10, label_y + label_height + 5),
-                    ],
-                    fill=(0, 200, 0, 200),
-                )
-                draw.text(
-                    (label_x, label_y), label, fill=(255, 255, 255), font=self.font
+                self._paste_action_label(
+                    marked_image, label, label_x, label_y, 10, (0, 200, 0, 200)
                 )
 
         return marked_image
 
 
 # Convenience functions
-_default_overlay = GridOverlay()
+@lru_cache(maxsize=1)
+def _default_overlay() -> GridOverlay:
+    """Default overlay, built on first use (reading GRID_CONFIG loads settings)."""
+    return GridOverlay()
 
 
 def apply_grid(image_input) -> Image.Image:
     """Apply grid overlay (convenience function)."""
-    return _default_overlay.apply(image_input)
+    return _default_overlay().apply(image_input)
 
 
 def process_screenshot(screenshot_path, save_path=None) -> tuple[Image.Image, str]:
     """Process screenshot (convenience function)."""
-    return _default_overlay.process_screenshot(screenshot_path, save_path)
+    return _default_overlay().process_screenshot(screenshot_path, save_path)
 
 
 if __name__ == "__main__":
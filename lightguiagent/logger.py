@@ -8,12 +8,18 @@ Records complete execution trace including:
 """
 
 import json
+import queue
+import threading
 import uuid
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
 from PIL import Image
 
+# Events after which buffered log lines are pushed to disk, so a crash loses
+# at most the current step
+_FLUSH_EVENTS = frozenset({"step_complete", "error", "task_complete"})
+
 
 class TaskLogger:
     """Task execution logger."""
@@ -38,8 +44,9 @@ class TaskLogger:
         # Generate or use provided session_id
         self.session_id = session_id or str(uuid.uuid4())
 
-        # Log file path
+        # Log file path, opened on the first event and kept open
         self.log_file = self.log_dir / f"{self.session_id}.jsonl"
+        self._log_fh = None
 
         print(f"📝 Logger initialized: {self.log_file}")
 
@@ -58,13 +65,26 @@ class TaskLogger:
             "data": data,
         }
 
-        # Write to JSONL file (one JSON object per line)
-        with open(self.log_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        self._write_entry(log_entry)
 
         if is_print:
             print(json.dumps(log_entry, indent=2, ensure_ascii=False))
 
+    def _write_entry(self, log_entry: Dict[str, Any]):
+        """Append a log entry to the JSONL file (one JSON object per line).
+
+        Lines go through a buffered handle instead of an open/write/close per
+        event; the buffer is flushed at the end of each step.
+        """
+        if self._log_fh is None:
+            self._log_fh = open(
+                self.log_file, "a", encoding="utf-8", buffering=64 * 1024
+            )
+        self._log_fh.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+
+        if log_entry["event_type"] in _FLUSH_EVENTS:
+            self._log_fh.flush()
+
     def log_task_start(self, task: str, config: Dict[str, Any]):
         """记录任务开始"""
         self.log_event("task_start", {"task": task, "config": config})
@@ -141,22 +161,65 @@ class TaskLogger:
         Returns:
             Path to saved image
         """
-        # Compress as JPEG format
-        image_rgb = image.convert("RGB")
-        image_path = (
-            self.image_dir / f"{self.session_id}_step{step_num:02d}_{image_type}.jpg"
-        )
+        image_path = self._image_path(step_num, image_type)
 
-        image_rgb.save(image_path, format="JPEG", quality=85)
+        self._write_image(image, image_path)
 
         return str(image_path)
 
+    def save_image_bytes(
+        self, data, step_num: int, image_type: str = "screenshot"
+    ) -> str:
+        """Save an already JPEG-encoded image to disk as-is.
+
+        Args:
+            data: JPEG bytes (or a bytes-like view)
+            step_num: Step number
+            image_type: Image type (screenshot, annotated, etc.)
+
+        Returns:
+            Path to saved image
+        """
+        image_path = self._image_path(step_num, image_type)
+
+        self._write_bytes(data, image_path)
+
+        return str(image_path)
+
+    def _image_path(self, step_num: int, image_type: str) -> Path:
+        """Build the image path for a step."""
+        return self.image_dir / f"{self.session_id}_step{step_num:02d}_{image_type}.jpg"
+
+    def _write_image(self, image: Image.Image, image_path: Path):
+        """Compress and write an image as JPEG."""
+        image_rgb = image.convert("RGB")
+        image_rgb.save(image_path, format="JPEG", quality=85)
+
+    def _write_bytes(self, data, image_path: Path):
+        """Write encoded image bytes."""
+        with open(image_path, "wb") as f:
+            f.write(data)
+
+    def flush(self):
+        """Push buffered log lines to disk."""
+        if self._log_fh is not None:
+            self._log_fh.flush()
+
+    def close(self):
+        """Flush and close the log file (it is reopened by the next event)."""
+        self.flush()
+        if self._log_fh is not None:
+            self._log_fh.close()
+            self._log_fh = None
+
     def read_logs(self) -> list:
         """Read log file.
 
         Returns:
             List of log entries
         """
+        self.flush()
+
         if not self.log_file.exists():
             return []
 
@@ -171,55 +234,123 @@ class TaskLogger:
     def get_summary(self) -> Dict[str, Any]:
         """Get task summary.
 
+        Streams the log file once, keeping only running totals instead of
+        loading every event.
+
         Returns:
             Task summary information
         """
-        logs = self.read_logs()
+        self.flush()
 
-        if not logs:
+        if not self.log_file.exists():
             return {"error": "No logs found"}
 
-        # Extract key information
-        task_start = next(
-            (log for log in logs if log["event_type"] == "task_start"), None
-        )
-        task_complete = next(
-            (log for log in logs if log["event_type"] == "task_complete"), None
-        )
-
-        step_completes = [log for log in logs if log["event_type"] == "step_complete"]
-        llm_responses = [log for log in logs if log["event_type"] == "llm_response"]
-
-        # Safely extract total tokens with fallback
+        has_logs = False
+        task_start = None
+        task_complete = None
+        total_steps = 0
+        total_step_time = 0
         total_tokens = 0
-        for log in llm_responses:
-            if "tokens" in log["data"]:
-                tokens_data = log["data"]["tokens"]
-                if "total_tokens" in tokens_data:
-                    total_tokens += tokens_data["total_tokens"]
-                elif "input_tokens" in tokens_data and "output_tokens" in tokens_data:
-                    # Calculate total from input + output if total_tokens is missing
-                    total_tokens += (
-                        tokens_data["input_tokens"] + tokens_data["output_tokens"]
-                    )
+
+        with open(self.log_file, "r", encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+
+                has_logs = True
+                log = json.loads(line)
+                event_type = log["event_type"]
+
+                if event_type == "step_complete":
+                    total_steps += 1
+                    total_step_time += log["data"]["total_time"]
+                elif event_type == "llm_response":
+                    # Safely extract total tokens with fallback
+                    tokens_data = log["data"].get("tokens", {})
+                    if "total_tokens" in tokens_data:
+                        total_tokens += tokens_data["total_tokens"]
+                    elif (
+                        "input_tokens" in tokens_data and "output_tokens" in tokens_data
+                    ):
+                        # Calculate total from input + output if total_tokens is missing
+                        total_tokens += (
+                            tokens_data["input_tokens"] + tokens_data["output_tokens"]
+                        )
+                elif event_type == "task_start" and task_start is None:
+                    task_start = log
+                elif event_type == "task_complete" and task_complete is None:
+                    task_complete = log
+
+        if not has_logs:
+            return {"error": "No logs found"}
 
         summary = {
             "session_id": self.session_id,
             "task": task_start["data"]["task"] if task_start else "Unknown",
-            "total_steps": len(step_completes),
+            "total_steps": total_steps,
             "success": task_complete["data"]["success"] if task_complete else False,
             "total_time": task_complete["data"]["total_time"] if task_complete else 0,
             "total_cost": task_complete["data"]["total_cost"] if task_complete else 0,
-            "avg_step_time": sum(log["data"]["total_time"] for log in step_completes)
-            / len(step_completes)
-            if step_completes
-            else 0,
+            "avg_step_time": total_step_time / total_steps if total_steps else 0,
             "total_tokens": total_tokens,
         }
 
         return summary
 
 
+class ThreadedTaskLogger(TaskLogger):
+    """Task logger that writes log lines and images on a background thread.
+
+    Events are timestamped and image paths are decided when the call is made,
+    so callers see the same results as with TaskLogger. Images handed to
+    save_image must not be modified afterwards.
+    """
+
+    def __init__(
+        self, log_dir: Path, image_dir: Path, session_id: Optional[str] = None
+    ):
+        super().__init__(log_dir, image_dir, session_id)
+
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(
+            target=self._drain, name="task-logger", daemon=True
+        )
+        self._worker.start()
+
+    def _drain(self):
+        """Run queued writes until the process exits."""
+        while True:
+            write, args = self._queue.get()
+            try:
+                write(*args)
+            except Exception as e:
+                # A failed log write must never take the task down
+                print(f"⚠️  Log write failed: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _write_entry(self, log_entry: Dict[str, Any]):
+        self._queue.put((super()._write_entry, (log_entry,)))
+
+    def _write_image(self, image: Image.Image, image_path: Path):
+        self._queue.put((super()._write_image, (image, image_path)))
+
+    def _write_bytes(self, data, image_path: Path):
+        self._queue.put((super()._write_bytes, (data, image_path)))
+
+    def flush(self):
+        """Block until every queued write has reached disk."""
+        self._queue.join()
+        super().flush()
+
+    def log_task_complete(
+        self, success: bool, total_steps: int, total_time: float, total_cost: float
+    ):
+        """记录任务完成"""
+        super().log_task_complete(success, total_steps, total_time, total_cost)
+        self.flush()
+
+
 # Convenience function
 def create_logger(base_dir: Path = None) -> TaskLogger:
     """Create a new task logger.
@@ -3,6 +3,8 @@
 import os
 import re
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional, Tuple
 
@@ -15,8 +17,13 @@ class AgentSettings(BaseModel):
 
     max_steps: int = Field(default=20, ge=1, le=100)
     delay_after_action: float = Field(default=2.0, ge=0.0, le=10.0)
+    adaptive_delay: bool = False  # Stop waiting early once the screen stops changing
     verbose: bool = True
     save_screenshots: bool = True
+    history_image_window: int = Field(default=10, ge=0, le=100)  # Steps that keep screenshots
+    screenshot_long_edge: int = Field(default=1280, ge=0)  # Downscale target, 0 = device size
+    ui_tree: bool = False  # Send the accessibility tree as text instead of the screenshot
+    ui_tree_max_chars: int = Field(default=2000, ge=100)  # Larger trees fall back to the screenshot
 
 
 class GridStyle(BaseModel):
@@ -42,6 +49,55 @@ class ClaudeSettings(BaseModel):
     model: str = "claude-opus-4-5-20251101"
     max_tokens: int = 2048
     temperature: float = 0.1
+    prompt_caching: bool = True  # Cache the static system prompt across steps
+
+
+def _adb_output(*args: str) -> str:
+    """Run an adb command and return its stripped stdout ("" on failure)."""
+    try:
+        return subprocess.run(
+            ["adb", *args],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def _query_device(serial: Optional[str]) -> Tuple[str, str, str]:
+    """Fetch manufacturer, model and `wm size` output in parallel.
+
+    Each query is its own adb shell round trip, so running them concurrently
+    costs one round trip of wall time instead of three.
+    """
+    target = ["-s", serial] if serial else []
+    queries = [
+        ("shell", "getprop", "ro.product.manufacturer"),
+        ("shell", "getprop", "ro.product.model"),
+        ("shell", "wm", "size"),
+    ]
+    with ThreadPoolExecutor(max_workers=len(queries)) as executor:
+        futures = [executor.submit(_adb_output, *target, *query) for query in queries]
+        return tuple(future.result() for future in futures)
+
+
+@lru_cache(maxsize=8)
+def _query_device_cached(serial: str) -> Tuple[str, str, str]:
+    """_query_device, memoized per device serial."""
+    return _query_device(serial)
+
+
+def _detect_device_info() -> Tuple[str, str, str]:
+    """Device info for the connected device, cached across Settings instances.
+
+    Keyed by `adb get-serialno`, so switching devices re-queries; without an
+    identifiable device nothing is cached.
+    """
+    serial = _adb_output("get-serialno")
+    if not serial or serial == "unknown":
+        return _query_device(None)
+    return _query_device_cached(serial)
 
 
 class Settings:
@@ -58,15 +114,7 @@ class Settings:
         # Load user config (optional)
         user_config = self._load_yaml(config_path)
 
-        # 🤖 Auto-detect device info (unless skipped)
-        if skip_auto_detect:
-            self.device_name = "Test Device"
-            self.screen_width, self.screen_height = 1080, 2400
-        else:
-            self.device_name = self._auto_detect_device()
-            self.screen_width, self.screen_height = self._auto_detect_screen()
-
-        # User settings
+        # User settings (parsed first: detection fallbacks read agent.verbose)
         agent_data = user_config.get("agent", {})
         self.agent = AgentSettings(**agent_data)
 
@@ -76,6 +124,15 @@ class Settings:
         claude_data = user_config.get("claude", {})
         self.claude = ClaudeSettings(**claude_data)
 
+        # 🤖 Auto-detect device info (unless skipped)
+        if skip_auto_detect:
+            self.device_name = "Test Device"
+            self.screen_width, self.screen_height = 1080, 2400
+        else:
+            manufacturer, model, wm_size = _detect_device_info()
+            self.device_name = self._auto_detect_device(manufacturer, model)
+            self.screen_width, self.screen_height = self._auto_detect_screen(wm_size)
+
         # Grid density: use user value OR auto-calculate
         if self.grid_style.cols is not None and self.grid_style.rows is not None:
             # User specified
@@ -110,45 +167,18 @@ class Settings:
 
         return {}
 
-    def _auto_detect_device(self) -> str:
-        """Auto-detect device name via ADB."""
-        try:
-            manufacturer = subprocess.run(
-                ["adb", "shell", "getprop", "ro.product.manufacturer"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            ).stdout.strip()
-
-            model = subprocess.run(
-                ["adb", "shell", "getprop", "ro.product.model"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            ).stdout.strip()
-
-            device_name = f"{manufacturer} {model}".strip()
-            return device_name if device_name else "Unknown Device"
-
-        except Exception:
-            return "Unknown Device"
-
-    def _auto_detect_screen(self) -> Tuple[int, int]:
-        """Auto-detect screen size via ADB."""
-        try:
-            result = subprocess.run(
-                ["adb", "shell", "wm", "size"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
-            match = re.search(r"(\d+)x(\d+)", result.stdout)
-            if match:
-                width = int(match.group(1))
-                height = int(match.group(2))
-                return width, height
-        except Exception:
-            pass
+    def _auto_detect_device(self, manufacturer: str, model: str) -> str:
+        """Build the device name from ADB getprop output."""
+        device_name = f"{manufacturer} {model}".strip()
+        return device_name if device_name else "Unknown Device"
+
+    def _auto_detect_screen(self, wm_size: str) -> Tuple[int, int]:
+        """Parse the screen size from ADB `wm size` output."""
+        match = re.search(r"(\d+)x(\d+)", wm_size)
+        if match:
+            width = int(match.group(1))
+            height = int(match.group(2))
+            return width, height
 
         # Fallback
         if self.agent.verbose:
@@ -0,0 +1,295 @@
+"""Tests for the agent's device I/O helpers without requiring ADB.
+
+Tests:
+1. Persistent shell session (run against a local `sh`)
+2. Quoting of typed text and background scrolls
+3. Adaptive settle wait
+4. Screen size changes during capture
+5. UI tree dump
+6. Raw screencap decoding and PNG fallback
+"""
+
+import io
+import queue
+import shlex
+import struct
+import subprocess
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from PIL import Image
+
+from lightguiagent import agent as agent_module
+from lightguiagent.agent import LightGUIAgent
+
+
+def make_agent() -> LightGUIAgent:
+    """Create an agent without connecting to a device."""
+    agent = LightGUIAgent.__new__(LightGUIAgent)
+    agent.verbose = False
+    agent.device_serial = None
+    agent._shell = None
+    agent._shell_output = None
+    agent._shell_lock = threading.Lock()
+    agent._executor = ThreadPoolExecutor(max_workers=1)
+    return agent
+
+
+def open_local_shell(agent: LightGUIAgent):
+    """Attach a local `sh` in place of the persistent `adb shell` session."""
+    agent._shell = subprocess.Popen(
+        ["sh"],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    agent._shell_output = queue.Queue()
+    threading.Thread(
+        target=agent._read_shell_output,
+        args=(agent._shell.stdout, agent._shell_output),
+        daemon=True,
+    ).start()
+
+
+def test_shell_run():
+    """Test running commands in the persistent shell session."""
+    agent = make_agent()
+    open_local_shell(agent)
+    try:
+        result = agent._shell_run("echo hello")
+        assert result.returncode == 0
+        assert result.stdout == "hello\n"
+
+        result = agent._shell_run("false")
+        assert result.returncode == 1
+
+        # A trailing comment must not swallow the completion sentinel
+        result = agent._shell_run("echo #hashtag", timeout=1)
+        assert result.returncode == 0
+        assert result.stdout == "\n"
+    finally:
+        agent.close()
+
+
+def test_shell_timeout_keeps_executor():
+    """A timed-out shell command only resets the session, not the worker."""
+    agent = make_agent()
+    open_local_shell(agent)
+    try:
+        with pytest.raises(subprocess.TimeoutExpired):
+            agent._shell_run("sleep 5", timeout=0.2)
+        assert agent._shell is None, "Out-of-sync session should be closed"
+
+        # The capture worker must still accept work
+        assert agent._executor.submit(lambda: 42).result(timeout=5) == 42
+    finally:
+        agent.close()
+
+
+def test_type_text_is_quoted():
+    """TYPE values reach the device shell as one literal argument."""
+    agent = make_agent()
+    agent.yadb_available = False
+    commands = []
+    agent._shell_command = lambda *args, **kwargs: commands.append(" ".join(args))
+
+    agent.execute_action({"action": "TYPE", "value": "#tag it's; ls &"})
+
+    assert shlex.split(commands[0], comments=True) == [
+        "input",
+        "text",
+        "#tag%sit's;%sls%s&",
+    ]
+    agent.close()
+
+
+def test_background_scroll_retries(monkeypatch):
+    """A background SCROLL gets the same retry as a blocking one."""
+    monkeypatch.setattr(agent_module.time, "sleep", lambda seconds: None)
+    agent = make_agent()
+    agent.screen_size = (1080, 2400)
+    agent._action_future = None
+    commands = []
+
+    def shell_command(*args, **kwargs):
+        commands.append(args)
+        if len(commands) == 1:
+            raise subprocess.TimeoutExpired("input swipe", 5)
+
+    agent._shell_command = shell_command
+    agent.execute_action({"action": "SCROLL", "value": "down"}, wait=False)
+    agent._action_future.result(timeout=5)
+
+    assert len(commands) == 2
+    assert commands[1] == ("input", "swipe", "540", "1680", "540", "720", "300")
+    agent.close()
+
+
+def test_wait_for_stable(monkeypatch):
+    """The settle wait needs several still probe pairs in a row."""
+    monkeypatch.setattr(agent_module, "STABLE_MIN_WAIT", 0)
+    monkeypatch.setattr(agent_module, "STABLE_POLL_INTERVAL", 0)
+
+    loading = Image.new("RGB", (80, 160), "white")
+    loaded = Image.new("RGB", (80, 160), "black")
+    frames = [loading, loading, loaded, loaded, loaded, loaded, loaded]
+
+    agent = make_agent()
+    agent._frame_buffer = None
+    captured = []
+
+    def capture_screenshot(out=None):
+        captured.append(frames[len(captured)])
+        return captured[-1]
+
+    agent.capture_screenshot = capture_screenshot
+
+    # A brief still loading screen doesn't end the wait early
+    assert agent._wait_for_stable(max_wait=10) is loaded
+    # Settles on the third still pair of the loaded screen
+    assert len(captured) == 6
+    agent.close()
+
+
+def test_capture_returns_new_grid_on_rotation():
+    """A size change is handed back as a new grid, not applied by the worker."""
+    agent = make_agent()
+    agent._configure_grid(1080, 2400)
+    agent._frame_buffer = None
+    agent._keep_raw_frames = True
+    converter = agent.grid_converter
+
+    rotated = Image.new("RGB", (2400, 1080), "white")
+    agent.capture_screenshot = lambda out=None: rotated
+
+    *_, new_grid = agent._capture_and_annotate()
+    assert agent.screen_size == (1080, 2400), "Worker must not switch the grid"
+    assert agent.grid_converter is converter
+    assert new_grid["screen_size"] == (2400, 1080)
+
+    agent._apply_grid(new_grid)
+    assert agent.screen_size == (2400, 1080)
+    agent.close()
+
+
+UI_DUMP = b"""<?xml version='1.0' encoding='UTF-8' standalone='yes' ?>\
+<hierarchy rotation="0">
+  <node text="" content-desc="" bounds="[0,0][1080,2400]">
+    <node text="Search" content-desc="" clickable="true" bounds="[440,100][640,200]" />
+    <node text="" content-desc="Home  tab" clickable="true" bounds="[0,2240][200,2360]" />
+    <node text="Latte" content-desc="" clickable="false" bounds="[800,1100][1000,1300]" />
+    <node text="   " content-desc="" clickable="true" bounds="[0,0][100,100]" />
+    <node text="No bounds" content-desc="" clickable="true" bounds="" />
+  </node>
+</hierarchy>UI hierchary dumped to: /dev/tty
+"""
+
+
+def test_dump_ui_tree():
+    """The accessibility dump becomes one grid-labelled line per element."""
+    agent = make_agent()
+    agent._configure_grid(1080, 2400)
+    agent._adb_exec_out = lambda *args, **kwargs: UI_DUMP
+
+    assert agent._dump_ui_tree(agent.grid_converter) == (
+        'F2: "Search" (clickable)\nA20: "Home tab" (clickable)\nI11: "Latte"'
+    )
+
+    agent._adb_exec_out = lambda *args, **kwargs: b"ERROR: could not get idle state."
+    assert agent._dump_ui_tree(agent.grid_converter) is None
+    agent.close()
+
+
+# 2x1 frame: a red and a blue pixel (RGBA, alpha ignored)
+RAW_PIXELS = bytes([255, 0, 0, 255, 0, 0, 255, 0])
+
+
+def raw_screencap(header_size=16, pixel_format=1, pixels=RAW_PIXELS) -> bytes:
+    """Build `screencap` raw output for a 2x1 frame."""
+    header = struct.pack("<III", 2, 1, pixel_format)
+    return header + bytes(header_size - 12) + pixels
+
+
+def test_capture_screenshot_raw():
+    """Raw frames decode with either header size, into a reused buffer."""
+    agent = make_agent()
+    for header_size in (12, 16):
+        data = raw_screencap(header_size)
+        agent._adb_exec_out = lambda *args, data=data, **kwargs: data
+        image = agent.capture_screenshot_raw()
+        assert image.mode == "RGB"
+        assert image.size == (2, 1)
+        assert [image.getpixel((x, 0)) for x in range(2)] == [(255, 0, 0), (0, 0, 255)]
+
+        buffer = Image.new("RGB", (2, 1))
+        assert agent.capture_screenshot_raw(out=buffer) is buffer
+        assert [buffer.getpixel((x, 0)) for x in range(2)] == [(255, 0, 0), (0, 0, 255)]
+    agent.close()
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        raw_screencap(pixels=RAW_PIXELS[:6]),  # Truncated payload
+        raw_screencap(pixel_format=4),  # Unsupported pixel format (RGB_565)
+        b"\x02\x00\x00",  # Truncated header
+    ],
+)
+def test_capture_screenshot_raw_invalid(data):
+    """Unexpected raw layouts raise ValueError."""
+    agent = make_agent()
+    agent._adb_exec_out = lambda *args, **kwargs: data
+    with pytest.raises(ValueError):
+        agent.capture_screenshot_raw()
+    agent.close()
+
+
+def test_capture_screenshot_png_fallback():
+    """An unsupported raw layout switches the agent to PNG captures."""
+    png = io.BytesIO()
+    Image.new("RGB", (2, 1), "green").save(png, format="PNG")
+
+    def adb_exec_out(*args, **kwargs):
+        return png.getvalue() if "-p" in args else raw_screencap(pixel_format=4)
+
+    agent = make_agent()
+    agent.raw_screencap = True
+    agent._adb_exec_out = adb_exec_out
+
+    image = agent.capture_screenshot()
+    assert image.size == (2, 1)
+    assert image.getpixel((0, 0)) == (0, 128, 0)
+    assert agent.raw_screencap is False, "Later captures should skip raw"
+    agent.close()
+
+
+def test_capture_screenshot_failed_read_keeps_raw(monkeypatch):
+    """A failed or empty read falls back for one frame without disabling raw."""
+    monkeypatch.setattr(
+        agent_module.subprocess,
+        "run",
+        lambda cmd, **kwargs: subprocess.CompletedProcess(cmd, 1, b"", b"closed"),
+    )
+    agent = make_agent()
+    with pytest.raises(RuntimeError):
+        agent._adb_exec_out("screencap")
+
+    png = io.BytesIO()
+    Image.new("RGB", (2, 1), "green").save(png, format="PNG")
+    reads = []
+
+    def adb_exec_out(*args, **kwargs):
+        reads.append(args)
+        if "-p" in args:
+            return png.getvalue()
+        raise RuntimeError("adb exec-out screencap failed (exit 0): no output")
+
+    agent.raw_screencap = True
+    agent._adb_exec_out = adb_exec_out
+
+    image = agent.capture_screenshot()
+    assert image.getpixel((0, 0)) == (0, 128, 0)
+    assert reads == [("screencap",), ("screencap", "-p")]
+    assert agent.raw_screencap is True, "A failed read is not a format problem"
+    agent.close()
@@ -0,0 +1,268 @@
+"""Tests for the Claude client without calling the API.
+
+Tests:
+1. Retry classification and delays
+2. Retry loop bounds
+3. Response parsing and validation
+4. Prompt caching layout
+5. UI tree requests and screenshot fallback
+6. Concurrent batch requests
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from anthropic import APIConnectionError, APIStatusError, RateLimitError
+
+from lightguiagent import claude_client
+from lightguiagent.claude_client import ClaudeClient, _is_retryable, _retry_delay
+
+
+def api_error(cls, status_code=None, headers=None):
+    """Build an anthropic error without an HTTP response object."""
+    error = cls.__new__(cls)
+    Exception.__init__(error, "test error")
+    if status_code is not None:
+        error.status_code = status_code
+        error.response = SimpleNamespace(headers=headers or {})
+    return error
+
+
+def make_response(text: str):
+    """Build a messages.create() response with one text block."""
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(
+            input_tokens=10,
+            output_tokens=5,
+            cache_read_input_tokens=0,
+            cache_creation_input_tokens=0,
+        ),
+    )
+
+
+def make_client(create) -> ClaudeClient:
+    """Create a client whose messages.create() is replaced by `create`."""
+    client = ClaudeClient(api_key="test-key", prompt_caching=False)
+    client.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    return client
+
+
+def test_is_retryable():
+    """Transient errors are retried; everything else is raised at once."""
+    assert _is_retryable(api_error(RateLimitError, 429))
+    assert _is_retryable(api_error(APIConnectionError))
+    assert _is_retryable(api_error(APIStatusError, 500))
+    assert _is_retryable(api_error(APIStatusError, 529))
+
+    assert not _is_retryable(api_error(APIStatusError, 400))
+    assert not _is_retryable(api_error(APIStatusError, 401))
+    assert not _is_retryable(ValueError("bad JSON"))
+
+
+def test_retry_delay():
+    """Server retry-after wins (uncapped); otherwise capped backoff."""
+    error = api_error(RateLimitError, 429, {"retry-after-ms": "1500"})
+    assert _retry_delay(0, error) == 1.5
+
+    error = api_error(RateLimitError, 429, {"retry-after": "60"})
+    assert _retry_delay(0, error) == 60.0
+
+    # HTTP-date form and missing headers fall back to backoff
+    http_date = {"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}
+    for error in (
+        api_error(RateLimitError, 429, http_date),
+        api_error(APIConnectionError),
+    ):
+        for attempt in range(3):
+            low = claude_client.RETRY_INITIAL * 2**attempt
+            delay = _retry_delay(attempt, error)
+            assert low <= delay <= low + claude_client.RETRY_JITTER
+
+    assert _retry_delay(20, api_error(APIConnectionError)) == claude_client.RETRY_MAX
+
+
+def test_get_action_retries(monkeypatch):
+    """max_retries counts retries after the first attempt."""
+    monkeypatch.setattr(claude_client.time, "sleep", lambda seconds: None)
+    calls = []
+
+    def create(**request):
+        calls.append(request)
+        if len(calls) < 3:
+            raise api_error(APIStatusError, 529)
+        return make_response('{"action": "COMPLETE"}')
+
+    client = make_client(create)
+    assert client.get_action("task", "b64", max_retries=2) == {"action": "COMPLETE"}
+    assert len(calls) == 3
+
+    # No retries: a single attempt, which still returns or raises cleanly
+    calls.clear()
+    with pytest.raises(RuntimeError, match="after 1 attempts") as excinfo:
+        client.get_action("task", "b64", max_retries=0)
+    assert len(calls) == 1
+    assert isinstance(excinfo.value.__cause__, APIStatusError)
+
+    async def acreate(**request):
+        create(**request)
+
+    client._aclient = SimpleNamespace(messages=SimpleNamespace(create=acreate))
+    calls.clear()
+    with pytest.raises(RuntimeError, match="after 1 attempts") as excinfo:
+        asyncio.run(client.aget_action("task", "b64", max_retries=0))
+    assert len(calls) == 1
+    assert isinstance(excinfo.value.__cause__, APIStatusError)
+
+    client.client.messages.create = lambda **request: make_response(
+        '{"action": "COMPLETE"}'
+    )
+    assert client.get_action("task", "b64", max_retries=0) == {"action": "COMPLETE"}
+
+    with pytest.raises(ValueError):
+        client.get_action("task", "b64", max_retries=-1)
+
+
+def test_parse_response():
+    """Fenced and bare JSON parse the same; extra keys are kept."""
+    client = make_client(None)
+    text = '{"action": "CLICK", "grid": "E5", "explain": "Open search"}'
+    expected = {"action": "CLICK", "grid": "E5", "explain": "Open search"}
+
+    assert client._parse_response(make_response(text)) == expected
+    assert client._parse_response(make_response(f"```json\n{text}\n```")) == expected
+    assert client._parse_response(make_response(f"  ```\n{text}```\n")) == expected
+
+    action = client._parse_response(
+        make_response('{"action": "SCROLL", "value": "down", "summary": "Menu"}')
+    )
+    assert action == {"action": "SCROLL", "value": "down", "summary": "Menu"}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        '{"action": "SCROLL", "value": "sideways"}',  # Bad SCROLL value
+        '{"action": "CLICK", "explain": "no grid"}',  # CLICK without grid
+        '{"action": "SWIPE", "value": "left"}',  # Unknown action
+        "I will click the search box.",  # Not JSON
+    ],
+)
+def test_parse_response_invalid(text):
+    """Invalid responses raise ValueError, chained to the validation error."""
+    client = make_client(None)
+    with pytest.raises(ValueError) as excinfo:
+        client._parse_response(make_response(text))
+    assert excinfo.value.__cause__ is not None
+
+
+def test_build_system():
+    """The system prompt is sent as a cache-marked block only with caching on."""
+    client = make_client(None)
+    assert client._build_system() == ClaudeClient.SYSTEM_PROMPT
+
+    client.prompt_caching = True
+    blocks = client._build_system()
+    assert blocks[0]["text"] == ClaudeClient.SYSTEM_PROMPT
+    assert blocks[0]["cache_control"] == {"type": "ephemeral"}
+
+
+def test_build_request_caching():
+    """History precedes the screenshot; only its last block is cache-marked."""
+    client = make_client(None)
+    client.prompt_caching = True
+    history = [
+        {"action": "CLICK", "grid": "E5", "explain": "Open search"},
+        {"action": "TYPE", "value": "latte", "explain": "Enter query"},
+    ]
+
+    content = client._build_request("task", "b64", history)["messages"][0]["content"]
+    image_index = [block["type"] for block in content].index("image")
+    assert image_index == len(history) + 1, "Goal and history blocks come first"
+
+    marked = [i for i, block in enumerate(content) if "cache_control" in block]
+    assert marked == [image_index - 1]
+
+    # The history blocks are a prefix of the next step's request
+    next_content = client._build_request("task", "b64", [*history, history[0]])
+    next_content = next_content["messages"][0]["content"]
+    for block, next_block in zip(content[:image_index], next_content):
+        assert block["text"] == next_block["text"]
+
+
+UI_TREE = 'F2: "Search" (clickable)\nI11: "Latte"'
+
+
+def content_types(request: dict) -> list:
+    """List the content block types of a request's user message."""
+    return [block["type"] for block in request["messages"][0]["content"]]
+
+
+def test_build_request_ui_tree():
+    """A UI tree replaces the screenshot unless the agent looks stuck."""
+    client = make_client(None)
+    history = [{"action": "CLICK", "grid": "F2", "explain": "Open search"}]
+
+    request = client._build_request("task", "b64", history, ui_tree=UI_TREE)
+    assert "image" not in content_types(request)
+    assert UI_TREE in request["messages"][0]["content"][-2]["text"]
+
+    # Two clicks on the same cell trigger a stuck warning: send the image
+    stuck = history * 2
+    request = client._build_request("task", "b64", stuck, ui_tree=UI_TREE)
+    assert "image" in content_types(request)
+
+
+def test_get_action_ui_tree_miss():
+    """A click outside the UI tree is asked again once, with the screenshot."""
+    requests = []
+    replies = iter(
+        ['{"action": "CLICK", "grid": "A1"}', '{"action": "CLICK", "grid": "B3"}']
+    )
+
+    def create(**request):
+        requests.append(request)
+        return make_response(next(replies))
+
+    client = make_client(create)
+    action = client.get_action("task", "b64", ui_tree=UI_TREE)
+
+    assert action == {"action": "CLICK", "grid": "B3"}
+    assert len(requests) == 2
+    assert "image" not in content_types(requests[0])
+    assert "image" in content_types(requests[1])
+
+    # A click on a cell from the tree is accepted as is
+    requests.clear()
+    replies = iter(['{"action": "CLICK", "grid": "f2"}'])
+    assert client.get_action("task", "b64", ui_tree=UI_TREE)["grid"] == "f2"
+    assert len(requests) == 1
+
+
+def test_aget_actions_batch():
+    """Batches respect the concurrency limit and keep failures in place."""
+    client = make_client(None)
+    in_flight = 0
+    peak = 0
+
+    async def aget_action(task, grid_image_b64, **kwargs):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        # Later tasks finish first, so results arrive out of order
+        await asyncio.sleep(0.01 * (10 - int(task)))
+        in_flight -= 1
+        if task == "3":
+            raise ValueError("bad JSON")
+        return {"action": "COMPLETE", "explain": task}
+
+    client.aget_action = aget_action
+    requests = [{"task": str(i), "grid_image_b64": "b64"} for i in range(8)]
+    results = asyncio.run(client.aget_actions_batch(requests, concurrency=3))
+
+    assert peak == 3
+    assert isinstance(results[3], ValueError)
+    assert [r["explain"] for i, r in enumerate(results) if i != 3] == [
+        str(i) for i in range(8) if i != 3
+    ]
@@ -7,11 +7,12 @@ Tests:
 3. Basic component integration
 """
 
+import base64
 from pathlib import Path
 from PIL import Image
 
 from lightguiagent.grid_converter import GridConverter
-from lightguiagent.grid_overlay import GridOverlay
+from lightguiagent.grid_overlay import GridOverlay, scale_grid_config
 
 # Use local debug dir to avoid config imports
 DEBUG_DIR = Path(__file__).parent.parent / "artifacts" / "debug"
@@ -44,61 +45,104 @@ def test_grid_converter():
         result = converter.grid_to_pixel(grid)
         assert result == expected_pixel, f"Grid {grid} → {result}, expected {expected_pixel}"
 
+    # Batch lookup, including labels that need normalizing
+    grids = [grid for grid, _ in test_cases] + [" e5 "]
+    expected = [pixel for _, pixel in test_cases] + [(486, 540)]
+    assert converter.grids_to_pixels(grids) == expected
+
     # Pixel → Grid
     for grid, pixel in test_cases:
         result = converter.pixel_to_grid(*pixel)
         assert result == grid, f"Pixel {pixel} → {result}, expected {grid}"
 
+    # Batch reverse lookup, including points off the canvas (clamped)
+    points = [pixel for _, pixel in test_cases] + [(-5, 9999)]
+    expected = [grid for grid, _ in test_cases] + ["A20"]
+    assert converter.pixels_to_grids(points) == expected
+
+
+# Overlay config shared by the overlay tests; explicit to avoid config.yaml
+# interference. Each test builds its own overlay so tests stay independent
+OVERLAY_CONFIG = {
+    "screen_width": 1080,
+    "screen_height": 2400,
+    "grid_cols": 10,
+    "grid_rows": 20,
+    "cell_width": 108,
+    "cell_height": 120,
+    "line_color": (255, 0, 0),
+    "line_width": 3,
+    "label_size": 32,
+    "label_color": (255, 255, 0),
+    "label_bg_color": (0, 0, 0, 180),
+    "target_size": 1568,
+    "compression_quality": 85,
+}
+
+
+def test_grid_overlay_blank():
+    """Test grid overlay on a blank canvas."""
+    overlay = GridOverlay(config=OVERLAY_CONFIG)
 
-def test_grid_overlay():
-    """Test grid overlay on blank and sample images with explicit config."""
-    # Use explicit config to avoid config.yaml interference
-    test_config = {
-        "screen_width": 1080,
-        "screen_height": 2400,
-        "grid_cols": 10,
-        "grid_rows": 20,
-        "cell_width": 108,
-        "cell_height": 120,
-        "line_color": (255, 0, 0),
-        "line_width": 3,
-        "label_size": 32,
-        "label_color": (255, 255, 0),
-        "label_bg_color": (0, 0, 0, 180),
-        "target_size": 1568,
-        "compression_quality": 85,
-    }
-    overlay = GridOverlay(config=test_config)
-
-    # Test 1: Blank canvas
     blank_image = Image.new("RGB", (1080, 2400), color=(240, 240, 240))
     annotated = overlay.apply(blank_image)
-    
+
     assert annotated is not None, "Annotated image should not be None"
     assert annotated.size == (1080, 2400), f"Expected size (1080, 2400), got {annotated.size}"
 
     output_path = DEBUG_DIR / "test_grid_blank.png"
-    annotated.save(output_path)
+    annotated.save(output_path, compress_level=1)
     assert output_path.exists(), f"Output file not created: {output_path}"
 
-    # Test 2: Compress and encode
+
+def test_grid_overlay_encode():
+    """Test compressing and base64-encoding an annotated image."""
+    overlay = GridOverlay(config=OVERLAY_CONFIG)
+    annotated = overlay.apply(Image.new("RGB", (1080, 2400), color=(240, 240, 240)))
+
     b64_string = overlay.compress_and_encode(annotated)
     assert len(b64_string) > 0, "Base64 string should not be empty"
     assert isinstance(b64_string, str), "Base64 should be a string"
 
-    # Test 3: Full pipeline with mock screenshot
+
+def test_grid_overlay_pipeline():
+    """Test the full screenshot pipeline with a mock screenshot."""
+    overlay = GridOverlay(config=OVERLAY_CONFIG)
+
     mock_screenshot = create_mock_screenshot()
     mock_path = DEBUG_DIR / "mock_screenshot.png"
-    mock_screenshot.save(mock_path)
+    mock_screenshot.save(mock_path, compress_level=1)
 
+    # The in-memory image goes straight in; mock_path is only for inspection
     annotated, b64 = overlay.process_screenshot(
-        mock_path, DEBUG_DIR / "test_grid_mock.png"
+        mock_screenshot, DEBUG_DIR / "test_grid_mock.png"
     )
     assert annotated.size == (1080, 2400), f"Expected size (1080, 2400), got {annotated.size}"
     assert len(b64) > 0, "Base64 should not be empty"
     assert (DEBUG_DIR / "test_grid_mock.png").exists(), "Mock grid file not created"
 
 
+def test_grid_overlay_scaled():
+    """Test the pipeline on downscaled canvases, as the agent sends them."""
+    mock_screenshot = create_mock_screenshot()
+
+    for scale in (0.5, 0.25):
+        config = scale_grid_config(OVERLAY_CONFIG, scale)
+        size = (config["screen_width"], config["screen_height"])
+        overlay = GridOverlay(config=config)
+
+        # Same grid on the smaller canvas: labels map to the same cells
+        assert overlay.converter.grid_to_pixel("J20") == (
+            int(9.5 * config["cell_width"]),
+            int(19.5 * config["cell_height"]),
+        )
+
+        canvas = overlay.resize(mock_screenshot, size)
+        annotated, jpeg, b64 = overlay.process_screenshot(canvas, return_bytes=True)
+        assert annotated.size == size, f"Expected size {size}, got {annotated.size}"
+        assert base64.b64decode(b64) == jpeg, "Base64 should encode the JPEG bytes"
+
+
 def create_mock_screenshot() -> Image.Image:
     """Create a mock screenshot with some UI elements."""
     from PIL import ImageDraw
@@ -146,7 +190,10 @@ def main():
         print("✅ Grid converter tests passed\n")
 
         print("Testing Grid Overlay...")
-        test_grid_overlay()
+        test_grid_overlay_blank()
+        test_grid_overlay_encode()
+        test_grid_overlay_pipeline()
+        test_grid_overlay_scaled()
         print("✅ Grid overlay tests passed\n")
 
         print("✅ All tests passed!")